@@ -0,0 +1,347 @@
+"""
+Benchmarks for the String operations.
+
+Runs every operation over inputs from 1 KB to 100 MB in several character
+mixes, and writes throughput (MB/s), peak memory and per-call latency
+percentiles as JSON. A second run can be compared against a saved baseline,
+failing when an operation got slower (or hungrier) past a threshold.
+
+Usage:
+    python benchmarks/bench.py --sizes 1K,1M --output baseline.json
+    python benchmarks/bench.py --sizes 1K,1M --compare baseline.json --threshold 0.2
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+# Run from a checkout without installing the package.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from string_encoding import String
+
+OPERATIONS = (
+    'base64', 'decode_base64',
+    'byte_pair_encoding', 'decode_byte_pair',
+    'cyclic_bits', 'decode_cyclic_bits',
+    'cyclic_chars', 'decode_cyclic_chars',
+    'histogram_of_chars',
+)
+
+MIXES = ('ascii_text', 'high_latin1', 'repetitive', 'random_printable', 'repeated_text',
+         'repeated_latin1')
+
+DEFAULT_SIZES = '1K,10K,100K,1M'
+
+UNITS = {'K': 1 << 10, 'M': 1 << 20}
+
+WORDS = ('the', 'quick', 'brown', 'fox', 'jumps', 'over', 'lazy', 'dog', 'config',
+         'value', 'message', 'template', 'encoding', 'String', 'payload', '42')
+
+# Arguments for the operations that take a number.
+NUM = {'cyclic_bits': 5, 'decode_cyclic_bits': 5, 'cyclic_chars': 7, 'decode_cyclic_chars': 7}
+
+# The operation whose output a decode operation takes as input.
+ENCODER = {
+    'decode_base64': 'base64',
+    'decode_byte_pair': 'byte_pair_encoding',
+    'decode_cyclic_bits': 'cyclic_bits',
+    'decode_cyclic_chars': 'cyclic_chars',
+}
+
+
+def parse_size(text: str) -> int:
+    """
+    Parse a size such as "1K", "100M" or "4096".
+
+    Args:
+        text: The size, with an optional K or M suffix
+
+    Returns:
+        The size in characters (one byte each)
+    """
+    text = text.strip().upper()
+    if text[-1:] in UNITS:
+        return int(text[:-1]) * UNITS[text[-1]]
+    return int(text)
+
+
+def make_input(mix: str, size: int, seed: int = 0) -> str:
+    """
+    Build a benchmark input of one character mix.
+
+    Args:
+        mix: One of MIXES
+        size: Number of characters
+        seed: Random seed, so runs are comparable
+
+    Returns:
+        The input string
+    """
+    rnd = random.Random(seed)
+    if mix == 'ascii_text':
+        words = []
+        length = 0
+        while length < size:
+            word = rnd.choice(WORDS)
+            words.append(word)
+            length += len(word) + 1
+        return ' '.join(words)[:size]
+    if mix == 'high_latin1':
+        return ''.join(map(chr, rnd.choices(range(160, 256), k=size)))
+    if mix == 'repetitive':
+        block = 'abcabcabd' * 7 + 'xyz '
+        return (block * (size // len(block) + 1))[:size]
+    if mix == 'random_printable':
+        return ''.join(map(chr, rnd.choices(range(32, 127), k=size)))
+    # Byte pair encoding takes one symbol per merge from the character groups
+    # the input does not use, so it rejects the random mixes. These periodic,
+    # few-group ones it accepts at every size.
+    if mix == 'repeated_text':
+        words = [word for word in WORDS if word.islower()]
+        sentence = ' '.join(rnd.choice(words) for _ in range(10)) + ' '
+        return (sentence * (size // len(sentence) + 1))[:size]
+    if mix == 'repeated_latin1':
+        block = ''.join(map(chr, rnd.choices(range(160, 256), k=48)))
+        return (block * (size // len(block) + 1))[:size]
+    raise ValueError(f'unknown mix {mix!r}')
+
+
+def prepare(op: str, text: str) -> String:
+    """
+    Build the String an operation runs on.
+
+    Decode operations run on the output of their encoder.
+
+    Args:
+        op: The String method name
+        text: The benchmark input
+
+    Returns:
+        The String to benchmark op on
+
+    Raises:
+        The error of the operation if it rejects the input, e.g.
+        CyclicCharsError for high-Latin-1 text
+    """
+    source = String(text)
+    if op in ENCODER:
+        source = _call(source, ENCODER[op])
+    _call(source, op)
+    return source
+
+
+def measure(op: str, source: String, min_time: float, max_calls: int) -> dict:
+    """
+    Time an operation and measure its peak memory.
+
+    Args:
+        op: The String method name
+        source: The input String
+        min_time: Keep calling until this many seconds have passed...
+        max_calls: ...or this many calls were made
+
+    Returns:
+        A result dict with calls, mb_per_s, latency_ms and peak_memory_bytes.
+        Throughput is measured on the operation's input, so decode cases
+        count the encoded size.
+    """
+    latencies = []
+    start = time.perf_counter()
+    while len(latencies) < max_calls and (not latencies or time.perf_counter() - start < min_time):
+        t0 = time.perf_counter()
+        _call(source, op)
+        latencies.append(time.perf_counter() - t0)
+
+    # A separate traced call: tracemalloc slows the timed calls down.
+    tracemalloc.start()
+    try:
+        _call(source, op)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    latencies.sort()
+    total = sum(latencies)
+    return {
+        'calls': len(latencies),
+        'mb_per_s': len(source) * len(latencies) / total / 1e6 if total else None,
+        'latency_ms': {
+            'min': latencies[0] * 1e3,
+            'p50': _percentile(latencies, 50) * 1e3,
+            'p90': _percentile(latencies, 90) * 1e3,
+            'p99': _percentile(latencies, 99) * 1e3,
+        },
+        'peak_memory_bytes': peak,
+    }
+
+
+def run(ops, mixes, sizes, min_time: float = 0.5, max_calls: int = 50, log=None) -> dict:
+    """
+    Run the benchmark matrix.
+
+    Args:
+        ops: Operation names
+        mixes: Character mix names
+        sizes: Input sizes in characters
+        min_time: Minimum timing time per case, in seconds
+        max_calls: Maximum number of timed calls per case
+        log: Optional file to print progress to
+
+    Returns:
+        A report dict with "meta" and "results"
+    """
+    results = []
+    for size in sizes:
+        for mix in mixes:
+            text = make_input(mix, size)
+            for op in ops:
+                result = {'op': op, 'mix': mix, 'size': size}
+                try:
+                    source = prepare(op, text)
+                except Exception as e:
+                    # The operation rejects this mix; record why instead.
+                    result['skipped'] = type(e).__name__
+                else:
+                    result.update(measure(op, source, min_time, max_calls))
+                results.append(result)
+                if log is not None:
+                    print(_describe(result), file=log, flush=True)
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        },
+        'results': results,
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> list:
+    """
+    Find the cases that regressed against a baseline report.
+
+    A case regresses when its throughput dropped, or its peak memory grew,
+    by more than threshold (a fraction, e.g. 0.2 for 20%), or when it was
+    measured in the baseline but is now skipped because the operation raised.
+
+    Args:
+        baseline: A saved report
+        current: A new report
+        threshold: The allowed relative change
+
+    Returns:
+        A list of (op, mix, size, metric, old, new) tuples; a newly skipped
+        case has metric "skipped", old None and new the error name
+    """
+    old = {_key(r): r for r in baseline['results'] if not r.get('skipped')}
+    regressions = []
+    for result in current['results']:
+        before = old.get(_key(result))
+        if before is None:
+            continue
+        if result.get('skipped'):
+            regressions.append(_key(result) + ('skipped', None, result['skipped']))
+            continue
+        # mb_per_s is None when the timed calls took no measurable time.
+        if (before['mb_per_s'] and result['mb_per_s'] is not None
+                and result['mb_per_s'] < before['mb_per_s'] * (1 - threshold)):
+            regressions.append(_key(result) + ('mb_per_s', before['mb_per_s'], result['mb_per_s']))
+        if result['peak_memory_bytes'] > before['peak_memory_bytes'] * (1 + threshold):
+            regressions.append(_key(result) + ('peak_memory_bytes', before['peak_memory_bytes'],
+                                               result['peak_memory_bytes']))
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmark the String operations.')
+    parser.add_argument('--ops', default=','.join(OPERATIONS),
+                        help='comma-separated operations (default: all)')
+    parser.add_argument('--mixes', default=','.join(MIXES),
+                        help='comma-separated character mixes (default: all)')
+    parser.add_argument('--sizes', default=DEFAULT_SIZES,
+                        help='comma-separated input sizes, e.g. 1K,1M,100M (default: %(default)s)')
+    parser.add_argument('--min-time', type=float, default=0.5,
+                        help='minimum seconds of timed calls per case (default: %(default)s)')
+    parser.add_argument('--max-calls', type=int, default=50,
+                        help='maximum timed calls per case (default: %(default)s)')
+    parser.add_argument('--output', help='write the JSON report to this file (default: stdout)')
+    parser.add_argument('--compare', metavar='BASELINE',
+                        help='fail if a case regressed against this saved report')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='allowed relative regression for --compare (default: %(default)s)')
+    args = parser.parse_args(argv)
+
+    ops = _split(args.ops, OPERATIONS, parser)
+    mixes = _split(args.mixes, MIXES, parser)
+    sizes = [parse_size(size) for size in args.sizes.split(',')]
+    report = run(ops, mixes, sizes, args.min_time, args.max_calls, log=sys.stderr)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as fh:
+            json.dump(report, fh, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as fh:
+            baseline = json.load(fh)
+        regressions = compare(baseline, report, args.threshold)
+        for op, mix, size, metric, old, new in regressions:
+            if metric == 'skipped':
+                print(f'REGRESSION {op} {mix} {size}: now skipped ({new})', file=sys.stderr)
+            else:
+                print(f'REGRESSION {op} {mix} {size}: {metric} {old:.4g} -> {new:.4g}',
+                      file=sys.stderr)
+        if regressions:
+            return 1
+        print('no regressions', file=sys.stderr)
+    return 0
+
+
+def _call(source: String, op: str):
+    """Call one String operation with its benchmark arguments."""
+    if op in NUM:
+        return getattr(source, op)(NUM[op])
+    return getattr(source, op)()
+
+
+def _percentile(values: list, pct: float) -> float:
+    """Return the nearest-rank percentile of sorted values."""
+    index = max(0, min(len(values) - 1, -(-len(values) * pct // 100) - 1))
+    return values[int(index)]
+
+
+def _key(result: dict) -> tuple:
+    """Identify a benchmark case."""
+    return result['op'], result['mix'], result['size']
+
+
+def _split(text: str, allowed: tuple, parser) -> list:
+    """Split a comma-separated option and check its values."""
+    values = [value.strip() for value in text.split(',') if value.strip()]
+    for value in values:
+        if value not in allowed:
+            parser.error(f'unknown value {value!r}; choose from {", ".join(allowed)}')
+    return values
+
+
+def _describe(result: dict) -> str:
+    """Format one result for the progress log."""
+    case = f"{result['op']:<20} {result['mix']:<17} {result['size']:>10}"
+    if result.get('skipped'):
+        return f"{case}  skipped ({result['skipped']})"
+    speed = 'n/a' if result['mb_per_s'] is None else f"{result['mb_per_s']:.2f}"
+    return (f"{case}  {speed:>10} MB/s  p50 {result['latency_ms']['p50']:9.3f} ms"
+            f"  peak {result['peak_memory_bytes'] / 1e6:8.2f} MB")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -17,6 +17,9 @@ setup(
     long_description_content_type="text/markdown",
     url="https://github.com/kamberasaf/string-encoding",
     packages=find_packages(),
+    extras_require={
+        "numpy": ["numpy"],
+    },
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: MIT License",
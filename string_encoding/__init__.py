@@ -4,7 +4,11 @@ String-Encoding Package
 A custom Python string class with advanced encoding and transformation features.
 """
 
-from .string import String
+from .string import String, is_valid_base64, validate_base64
+from .model import BytePairModel
+from .pipeline import Pipeline
+from .builder import StringBuilder
+from . import codec  # registers the se-* text encodings
 
-__all__ = ['String']
+__all__ = ['String', 'BytePairModel', 'Pipeline', 'StringBuilder', 'is_valid_base64', 'validate_base64']
 __version__ = '0.1.0'
\ No newline at end of file
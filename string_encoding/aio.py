@@ -0,0 +1,188 @@
+"""
+asyncio streaming codecs.
+
+The async generators in this module read from an ``asyncio.StreamReader``
+(anything with an awaitable ``read``) or an async iterable of chunks, and
+yield ``bytes`` ready for ``StreamWriter.write``, one byte per character as
+in the String methods. They handle one bounded chunk at a time and give
+control back to the event loop between chunks, so many large bodies can be
+encoded at once without stalling other connections::
+
+    async for piece in aencode_base64(reader):
+        writer.write(piece)
+        await writer.drain()
+
+CPU-heavy chunks can be moved off the event loop by passing an
+``executor`` (e.g. a ``ThreadPoolExecutor`` or ``ProcessPoolExecutor``).
+"""
+
+import asyncio
+
+from . import b64, chars
+from .string import (Base64DecodeError, CyclicCharsError, CyclicCharsDecodeError,
+                     str_2_bytes, valid_num_check)
+
+# A multiple of 3 (encoding) and 4 (decoding) so that chunks split cleanly.
+DEFAULT_CHUNK_SIZE = 3 * 4 * 2 ** 14
+
+
+async def aencode_base64(src, chunk_size: int = DEFAULT_CHUNK_SIZE, executor=None):
+    """
+    Encode an async stream to Base64, like String.base64.
+
+    Args:
+        src: A StreamReader or an async iterable of bytes/str chunks
+        chunk_size: Number of bytes read per call
+        executor: Optional executor to encode the chunks in
+
+    Yields:
+        Pieces of the ASCII Base64 bytes, in order
+    """
+    carry = b''
+    async for chunk in _achunks(src, chunk_size):
+        data = carry + chunk
+        full = len(data) - len(data) % 3
+        carry = data[full:]
+        if full:
+            yield await _call(executor, b64.encode_bytes, data[:full])
+    if carry:
+        yield await _call(executor, b64.encode_bytes, carry)
+
+
+async def adecode_base64(src, chunk_size: int = DEFAULT_CHUNK_SIZE, executor=None):
+    """
+    Decode an async Base64 stream, like String.decode_base64.
+
+    Args:
+        src: A StreamReader or an async iterable of bytes/str chunks
+        chunk_size: Number of bytes read per call
+        executor: Optional executor to decode the chunks in
+
+    Yields:
+        Pieces of the decoded ASCII bytes, in order
+
+    Raises:
+        Base64DecodeError: If the stream cannot be decoded with base64. Pieces
+            yielded before the error was found are not retracted.
+    """
+    carry = b''
+    seen = False
+    async for chunk in _achunks(src, chunk_size):
+        data = carry + chunk.translate(None, b64.STRIP_BYTES)
+        full = len(data) - len(data) % 4
+        carry = data[full:]
+        if full:
+            seen = True
+            yield await _call(executor, _decode_block, data[:full])
+    if carry or not seen:
+        yield await _call(executor, _decode_block, carry)
+
+
+async def acyclic_chars(src, num: int, chunk_size: int = DEFAULT_CHUNK_SIZE, executor=None):
+    """
+    Shift an async stream of printable ASCII, like String.cyclic_chars.
+
+    Args:
+        src: A StreamReader or an async iterable of bytes/str chunks
+        num: Number of ASCII positions to shift each character
+        chunk_size: Number of bytes read per call
+        executor: Optional executor to shift the chunks in
+
+    Yields:
+        Pieces of the shifted bytes, in order
+
+    Raises:
+        CyclicCharsError: If the stream holds a character outside 32-126.
+            Pieces yielded before it was found are not retracted.
+    """
+    message = f"can't use cyclic chars with number {num}"
+    table = chars.cyclic_byte_table(valid_num_check(num) % chars.PRINTABLE_COUNT)
+    async for chunk in _achunks(src, chunk_size):
+        yield await _call(executor, _shift, chunk, table, CyclicCharsError, message)
+
+
+async def adecode_cyclic_chars(src, num: int, chunk_size: int = DEFAULT_CHUNK_SIZE, executor=None):
+    """
+    Undo acyclic_chars, like String.decode_cyclic_chars.
+
+    Args:
+        src: A StreamReader or an async iterable of bytes/str chunks
+        num: The same number used during encoding
+        chunk_size: Number of bytes read per call
+        executor: Optional executor to shift the chunks in
+
+    Yields:
+        Pieces of the original bytes, in order
+
+    Raises:
+        CyclicCharsDecodeError: If the stream holds a character outside
+            32-126. Pieces yielded before it was found are not retracted.
+    """
+    message = f"can't use decode cyclic chars with number {num}"
+    table = chars.cyclic_byte_table(-valid_num_check(num) % chars.PRINTABLE_COUNT)
+    async for chunk in _achunks(src, chunk_size):
+        yield await _call(executor, _shift, chunk, table, CyclicCharsDecodeError, message)
+
+
+async def awrite_all(writer, pieces) -> int:
+    """
+    Write the pieces of an async codec to a StreamWriter, draining as it goes.
+
+    Args:
+        writer: An asyncio.StreamWriter, or anything with write and drain
+        pieces: An async iterable of bytes, e.g. aencode_base64(reader)
+
+    Returns:
+        The number of bytes written
+    """
+    written = 0
+    async for piece in pieces:
+        writer.write(piece)
+        await writer.drain()
+        written += len(piece)
+    return written
+
+
+async def _achunks(src, chunk_size: int):
+    """Yield the non-empty chunks of a StreamReader or async iterable as bytes."""
+    if hasattr(src, 'read'):
+        while True:
+            chunk = await src.read(chunk_size)
+            if not chunk:
+                return
+            yield _as_bytes(chunk)
+    else:
+        async for chunk in src:
+            if chunk:
+                yield _as_bytes(chunk)
+
+
+def _as_bytes(chunk) -> bytes:
+    """Convert a chunk to bytes, one byte per character for str."""
+    if isinstance(chunk, str):
+        return str_2_bytes(chunk)
+    return bytes(chunk)
+
+
+async def _call(executor, func, *args):
+    """Run func in the executor if there is one, else inline after yielding control."""
+    if executor is None:
+        await asyncio.sleep(0)
+        return func(*args)
+    # Inside a coroutine get_event_loop returns the running loop, also on 3.6.
+    return await asyncio.get_event_loop().run_in_executor(executor, func, *args)
+
+
+def _decode_block(block: bytes) -> bytes:
+    """Decode one stripped block, applying the same checks as decode_base64."""
+    raw = b64.decode_bytes(block)
+    if raw is None or max(raw, default=0) > 127:  # bytes.isascii needs 3.7
+        raise Base64DecodeError(block, 'cannot be decode with base 64')
+    return raw
+
+
+def _shift(chunk: bytes, table: bytes, error: type, message: str) -> bytes:
+    """Shift one chunk through a byte table, rejecting unprintable bytes."""
+    if chars.first_unprintable(chunk) is not None:
+        raise error(chunk, message)
+    return chunk.translate(table)
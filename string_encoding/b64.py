@@ -0,0 +1,251 @@
+"""
+Table-driven Base64 engine.
+
+Works on 24-bit integer groups with precomputed forward and reverse alphabet
+tables instead of building intermediate '0'/'1' bit strings. The output
+matches the historical behaviour of :meth:`String.base64` exactly: no ``=``
+padding is emitted, and decoding skips control codes and ``=`` anywhere in
+the input.
+"""
+
+import re
+
+from . import chars
+
+ALPHABET = 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/'
+
+# Forward table: sextet value -> Base64 character.
+ENCODE_TABLE = tuple(ALPHABET)
+
+# Reverse table: Base64 character -> sextet value.
+DECODE_TABLE = {c: i for i, c in enumerate(ALPHABET)}
+
+# 12-bit value -> two Base64 characters, so a 24-bit group needs two lookups.
+PAIR_TABLE = tuple(a + b for a in ALPHABET for b in ALPHABET)
+
+# Characters ignored by the decoder: control codes (0-31, 127) and '='.
+STRIP_TABLE = {i: None for i in chars.class_members(chars.CONTROL) + [ord('=')]}
+
+# Byte versions of the decoder tables, for decode_bytes.
+DECODE_BYTES = {c: i for i, c in enumerate(ALPHABET.encode('ascii'))}
+STRIP_BYTES = bytes(STRIP_TABLE)
+
+# Characters that are neither in the alphabet nor skipped by the decoder.
+_INVALID = re.compile(r'[^A-Za-z0-9+/=\x00-\x1f\x7f]')
+_INVALID_BYTES = re.compile(rb'[^A-Za-z0-9+/=\x00-\x1f\x7f]')
+
+# Decoded bytes must be ASCII. A byte is above 127 exactly when its top bit is
+# set: bit 5 of the first sextet of a group, bit 3 of the second or bit 1 of
+# the third. These patterns find a sextet with that bit set, per position.
+_HIGH_BIT = tuple('[' + re.escape(''.join(c for i, c in enumerate(ALPHABET) if i & bit)) + ']'
+                  for bit in (32, 8, 2))
+_HIGH = tuple(re.compile(pattern) for pattern in _HIGH_BIT)
+_HIGH_BYTES = tuple(re.compile(pattern.encode('ascii')) for pattern in _HIGH_BIT)
+
+# Input characters checked per block by first_invalid, and stripped per
+# block by decode_bytes for buffers without a translate method.
+_CHECK_BLOCK = 1 << 16
+
+
+def encode(data: bytes) -> str:
+    """
+    Encode bytes to unpadded Base64 text.
+
+    Args:
+        data: The bytes to encode
+
+    Returns:
+        The Base64 text, without '=' padding
+    """
+    return ''.join(_encode(data, PAIR_TABLE, ENCODE_TABLE))
+
+
+def encode_bytes(data) -> bytes:
+    """
+    Encode a bytes-like object to unpadded Base64 bytes.
+
+    Args:
+        data: Any object supporting the buffer protocol
+
+    Returns:
+        The ASCII Base64 bytes, without '=' padding
+    """
+    # Joining the str pieces and encoding once is much faster than joining
+    # millions of two-byte bytes objects.
+    return ''.join(_encode(memoryview(data).cast('B'), PAIR_TABLE, ENCODE_TABLE)).encode('ascii')
+
+
+def _encode(data, pairs, singles) -> list:
+    """Encode byte values to a list of Base64 pieces from the given tables."""
+    full = len(data) - len(data) % 3
+    out = []
+    it = iter(data[:full])
+    for a, b, c in zip(it, it, it):
+        n = (a << 16) | (b << 8) | c
+        out.append(pairs[n >> 12])
+        out.append(pairs[n & 0xFFF])
+
+    rest = data[full:]
+    if len(rest) == 1:
+        out.append(pairs[rest[0] << 4])
+    elif len(rest) == 2:
+        n = (rest[0] << 10) | (rest[1] << 2)
+        out.append(pairs[n >> 6])
+        out.append(singles[n & 0x3F])
+    return out
+
+
+def decode(text: str) -> bytes or None:
+    """
+    Decode Base64 text to bytes.
+
+    Control codes and '=' are skipped. Trailing bits that do not fill a
+    whole byte are dropped.
+
+    Args:
+        text: The Base64 text to decode
+
+    Returns:
+        The decoded bytes, or None if the text is not valid Base64
+    """
+    return _decode(text.translate(STRIP_TABLE), DECODE_TABLE)
+
+
+def decode_bytes(data) -> bytes or None:
+    """
+    Decode Base64 from a bytes-like object, like decode.
+
+    Args:
+        data: Any object supporting the buffer protocol, holding ASCII text
+
+    Returns:
+        The decoded bytes, or None if the data is not valid Base64
+    """
+    return _decode(_strip_bytes(data), DECODE_BYTES)
+
+
+def _strip_bytes(data):
+    """
+    Remove the skipped bytes from a bytes-like object.
+
+    bytes and bytearray are translated directly. Other buffers, such as
+    memoryviews, have no translate method and are stripped one block-sized
+    copy at a time, so the input is never copied whole.
+    """
+    if isinstance(data, (bytes, bytearray)):
+        return data.translate(None, STRIP_BYTES)
+    view = memoryview(data).cast('B')
+    return b''.join(bytes(view[i:i + _CHECK_BLOCK]).translate(None, STRIP_BYTES)
+                    for i in range(0, len(view), _CHECK_BLOCK))
+
+
+def _decode(scrunched, table) -> bytes or None:
+    """Decode stripped Base64 characters or bytes through a reverse table."""
+    if not scrunched or len(scrunched) % 4 == 1:
+        return None
+
+    full = len(scrunched) - len(scrunched) % 4
+    out = bytearray()
+    try:
+        it = iter(scrunched[:full])
+        for a, b, c, d in zip(it, it, it, it):
+            n = (table[a] << 18) | (table[b] << 12) | (table[c] << 6) | table[d]
+            out += n.to_bytes(3, 'big')
+
+        rest = scrunched[full:]
+        if len(rest) == 2:
+            out.append(((table[rest[0]] << 6) | table[rest[1]]) >> 4)
+        elif len(rest) == 3:
+            n = ((table[rest[0]] << 12) | (table[rest[1]] << 6) | table[rest[2]]) >> 2
+            out += n.to_bytes(2, 'big')
+    except KeyError:
+        return None
+    return bytes(out)
+
+
+def first_invalid(data) -> int or None:
+    """
+    Find where Base64 text fails the checks of String.decode_base64.
+
+    The rules are the same, but nothing is decoded: control codes and '='
+    are skipped, every other character must be in the alphabet, their number
+    must not be 1 more than a multiple of 4, and the decoded bytes must be
+    ASCII. The input is stripped block by block and each position of the
+    4-character groups is checked with one regular expression search.
+
+    Args:
+        data: Base64 text, or a bytes-like object holding it
+
+    Returns:
+        None if the text is valid. Otherwise the offset of the first
+        character that is outside the alphabet or would decode to a byte
+        above 127, or len(data) if the text has no Base64 characters or ends
+        with a lone character after its last full group.
+    """
+    if isinstance(data, str):
+        invalid, high, table, carry = _INVALID, _HIGH, DECODE_TABLE, ''
+        strip = lambda piece: piece.translate(STRIP_TABLE)
+    else:
+        if not isinstance(data, bytes):
+            data = memoryview(data).cast('B')
+        invalid, high, table, carry = _INVALID_BYTES, _HIGH_BYTES, DECODE_BYTES, b''
+        strip = lambda piece: bytes(piece).translate(None, STRIP_BYTES)
+
+    match = invalid.search(data)
+    end = match.start() if match else len(data)
+    seen = False
+    for start in range(0, end, _CHECK_BLOCK):
+        stop = min(start + _CHECK_BLOCK, end)
+        block = carry + strip(data[start:stop])
+        seen = seen or bool(block)
+        full = len(block) - len(block) % 4
+        index = _first_high(block, full, high, 3)
+        if index is not None:
+            return _symbol_offset(data, start, stop, index - len(carry), table)
+        carry = block[full:]
+
+    # The unfinished last group: its second sextet only counts if a third follows.
+    index = _first_high(carry, len(carry), high, 2 if len(carry) == 3 else 1)
+    if index is not None:
+        return _symbol_offset(data, end, end, index - len(carry), table)
+    if match:
+        return end
+    if not seen or len(carry) == 1:
+        return len(data)
+    return None
+
+
+def _first_high(block, full: int, high: tuple, positions: int) -> int or None:
+    """Return the index of the first sextet in block[:full] with its group position's high bit set."""
+    found = []
+    for pos in range(positions):
+        hit = high[pos].search(block[pos:full:4])
+        if hit is not None:
+            found.append(hit.start() * 4 + pos)
+    return min(found) if found else None
+
+
+def _symbol_offset(data, start: int, stop: int, index: int, table: dict) -> int:
+    """
+    Return the offset of a Base64 character of data.
+
+    Args:
+        data: The input, holding only alphabet and skipped characters before stop
+        start: Offset the count of Base64 characters is relative to
+        stop: End of the block that starts at start
+        index: Number of Base64 characters between start and the wanted one;
+            negative counts backwards from start
+    """
+    if index >= 0:
+        for offset in range(start, stop):
+            if data[offset] in table:
+                if index == 0:
+                    return offset
+                index -= 1
+    else:
+        for offset in range(start - 1, -1, -1):
+            if data[offset] in table:
+                index += 1
+                if index == 0:
+                    return offset
+    raise AssertionError('unreachable: the character was counted in data')
@@ -0,0 +1,86 @@
+"""
+Batch encoding of many independent strings across processes.
+
+:func:`encode_many` applies one String method to every item of a list,
+spreading the work over a ``ProcessPoolExecutor``. Results come back in input
+order, and an item that fails yields its exception instead of aborting the
+whole batch. Small batches run inline, where starting processes would cost
+more than the work itself.
+"""
+
+import concurrent.futures
+import os
+
+from .string import String
+
+# String methods encode_many can apply.
+OPS = frozenset([
+    'base64', 'decode_base64',
+    'byte_pair_encoding', 'decode_byte_pair',
+    'cyclic_bits', 'decode_cyclic_bits',
+    'cyclic_chars', 'decode_cyclic_chars',
+    'histogram_of_chars',
+])
+
+# Batches with fewer items than this run in the calling process.
+INLINE_THRESHOLD = 1000
+
+
+def encode_many(items, op: str = 'base64', args: tuple = (), workers: int = None,
+                chunksize: int = None, inline_threshold: int = INLINE_THRESHOLD) -> list:
+    """
+    Apply a String method to many strings, in parallel when worthwhile.
+
+    Args:
+        items: An iterable of strings
+        op: The name of the String method to apply
+        args: Extra positional arguments for the method, e.g. (5,) for
+            cyclic_chars
+        workers: Number of worker processes (default: the CPU count)
+        chunksize: Number of items sent to a worker at a time
+        inline_threshold: Batches smaller than this run in this process
+
+    Returns:
+        A list with one entry per item, in input order: the method's result,
+        or the exception it raised (e.g. Base64DecodeError)
+
+    Raises:
+        ValueError: If op is not one of OPS
+    """
+    if op not in OPS:
+        raise ValueError(f'unknown operation {op!r}')
+    items = list(items)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(items) < inline_threshold:
+        return run_chunk(op, args, items)
+
+    if chunksize is None:
+        chunksize = max(1, -(-len(items) // (workers * 4)))
+    chunks = [items[i:i + chunksize] for i in range(0, len(items), chunksize)]
+    results = []
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(run_chunk, op, args, chunk) for chunk in chunks]
+        for future in futures:
+            results.extend(future.result())
+    return results
+
+
+def run_chunk(op: str, args: tuple, items: list) -> list:
+    """
+    Apply a String method to each item, capturing exceptions per item.
+
+    Args:
+        op: The name of the String method to apply
+        args: Extra positional arguments for the method
+        items: The strings to process
+
+    Returns:
+        A list of results or exceptions, in input order
+    """
+    results = []
+    for item in items:
+        try:
+            results.append(getattr(String(item), op)(*args))
+        except Exception as e:
+            results.append(e)
+    return results
@@ -0,0 +1,199 @@
+"""
+Byte-level versions of the String encoders.
+
+The functions here take any object supporting the buffer protocol (bytes,
+bytearray, memoryview, mmap, array) instead of a :class:`String`, so binary
+data such as network buffers or memory-mapped files can be encoded without
+first building a Python ``str``. Each byte stands for the character with the
+same code, as in the String methods, and the results are the same bytes the
+String methods would produce.
+
+Functions that take an ``out`` argument write their result into that
+writable buffer and return the number of bytes written; without it they
+return a new ``bytes`` object.
+"""
+
+import functools
+
+from . import b64, bits, bpe
+from .string import String, Base64DecodeError, BytePairDecodeError, strip_last_nul
+
+# Input bytes encoded per step, a multiple of 3 so blocks join without padding.
+BLOCK_SIZE = 3 * 2 ** 14
+
+
+def b64_encoded_length(size: int) -> int:
+    """
+    Return the length of the Base64 encoding of size bytes.
+
+    Args:
+        size: Number of input bytes
+
+    Returns:
+        Number of output bytes, without '=' padding
+    """
+    return size // 3 * 4 + (0, 2, 3)[size % 3]
+
+
+def b64encode_bytes(data, out=None) -> bytes or int:
+    """
+    Encode a buffer to Base64, like String.base64.
+
+    The input is read in blocks through a memoryview, and with out each block
+    is written straight into the output buffer.
+
+    Args:
+        data: Any object supporting the buffer protocol
+        out: Optional writable buffer of at least b64_encoded_length(len(data))
+            bytes
+
+    Returns:
+        The ASCII Base64 bytes, or the number of bytes written to out
+
+    Raises:
+        ValueError: If out is too small
+    """
+    view = memoryview(data).cast('B')
+    if out is None:
+        return b64.encode_bytes(view)
+
+    target = _target(out, b64_encoded_length(len(view)))
+    pos = 0
+    for start in range(0, len(view), BLOCK_SIZE):
+        encoded = b64.encode_bytes(view[start:start + BLOCK_SIZE])
+        target[pos:pos + len(encoded)] = encoded
+        pos += len(encoded)
+    return pos
+
+
+def b64decode_bytes(data, out=None) -> bytes or int:
+    """
+    Decode Base64 from a buffer, like String.decode_base64.
+
+    Unlike String.decode_base64, decoded bytes above 127 are allowed.
+
+    Args:
+        data: Any object supporting the buffer protocol, holding ASCII text
+        out: Optional writable buffer for the decoded bytes
+
+    Returns:
+        The decoded bytes, or the number of bytes written to out
+
+    Raises:
+        Base64DecodeError: If the data cannot be decoded with base64
+        ValueError: If out is too small
+    """
+    raw = b64.decode_bytes(data)
+    if raw is None:
+        raise Base64DecodeError(data, 'cannot be decode with base 64')
+    return _emit(raw, out)
+
+
+def cyclic_bits_bytes(data, num: int, out=None) -> bytes or int:
+    """
+    Rotate the bits of a buffer, like String.cyclic_bits.
+
+    As in String.cyclic_bits, one trailing NUL byte of the result is dropped.
+
+    Args:
+        data: Any object supporting the buffer protocol
+        num: Number of bit positions to shift
+        out: Optional writable buffer of at least len(data) bytes
+
+    Returns:
+        The rotated bytes, or the number of bytes written to out
+
+    Raises:
+        ValueError: If out is too small
+    """
+    return _emit(strip_last_nul(bits.rotate_left(memoryview(data).cast('B'), num)), out)
+
+
+def decode_cyclic_bits_bytes(data, num: int, out=None) -> bytes or int:
+    """
+    Undo cyclic_bits_bytes, like String.decode_cyclic_bits.
+
+    Args:
+        data: Any object supporting the buffer protocol
+        num: The same number used during encoding
+        out: Optional writable buffer of at least len(data) bytes
+
+    Returns:
+        The rotated bytes, or the number of bytes written to out
+
+    Raises:
+        ValueError: If out is too small
+    """
+    return _emit(strip_last_nul(bits.rotate_right(memoryview(data).cast('B'), num)), out)
+
+
+def bpe_encode_bytes(data) -> tuple:
+    """
+    Compress a buffer with byte pair encoding, like String.byte_pair_encoding.
+
+    The merge engine works on characters, so the buffer is viewed as one
+    Latin-1 character per byte for the duration of the call.
+
+    Args:
+        data: Any object supporting the buffer protocol
+
+    Returns:
+        A tuple of the encoded bytes and the list of rules ("X = ab")
+
+    Raises:
+        BytePairError: If the data cannot be compressed with byte pair encoding
+    """
+    encoded = String(bytes(data).decode('latin-1')).byte_pair_encoding()
+    return encoded.encode('latin-1'), encoded.rules
+
+
+def bpe_decode_bytes(data, rules: list, out=None) -> bytes or int:
+    """
+    Undo bpe_encode_bytes, like String.decode_byte_pair.
+
+    Args:
+        data: Any object supporting the buffer protocol
+        rules: The rules returned by bpe_encode_bytes
+        out: Optional writable buffer for the decoded bytes
+
+    Returns:
+        The decoded bytes, or the number of bytes written to out
+
+    Raises:
+        BytePairDecodeError: If the rules are empty or not valid byte pair rules
+        ValueError: If out is too small
+    """
+    table = _byte_expansions(tuple(rules)) if rules else None
+    if table is None:
+        raise BytePairDecodeError(data, "can't be used for byte pair decoding")
+    return _emit(b''.join(map(table.__getitem__, memoryview(data).cast('B'))), out)
+
+
+@functools.lru_cache(maxsize=128)
+def _byte_expansions(rules: tuple) -> tuple or None:
+    """Expand every byte value through the rules, or None if they are invalid."""
+    expansions = bpe.expansion_table(rules)
+    if expansions is None or any(code > 255 for code in expansions):
+        return None
+    try:
+        return tuple(expansions.get(i, chr(i)).encode('latin-1') for i in range(256))
+    except UnicodeEncodeError:
+        return None
+
+
+def _target(out, size: int) -> memoryview:
+    """Return a byte view of out, checking that it can hold size bytes."""
+    target = memoryview(out).cast('B')
+    if target.readonly:
+        raise ValueError('output buffer is read-only')
+    if len(target) < size:
+        raise ValueError(f'output buffer too small: {size} bytes needed, {len(target)} given')
+    return target
+
+
+def _emit(result: bytes, out) -> bytes or int:
+    """Return result, or copy it into out and return its length."""
+    if out is None:
+        return result
+    _target(out, len(result))[:len(result)] = result
+    return len(result)
@@ -0,0 +1,131 @@
+"""
+Whole-buffer bit rotation.
+
+Rotates all the bits of a byte string in one operation by treating it as a
+single big integer, instead of moving one bit at a time. Files are rotated
+out of core: each output chunk is computed from at most two memory-mapped
+source windows, so memory use is bounded by the chunk size.
+"""
+
+import mmap
+import os
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+
+def rotate_left(data: bytes, num: int) -> bytes:
+    """
+    Rotate the bits of a byte string to the left.
+
+    The first byte holds the most significant bits. Shifts wrap around, so
+    negative shifts rotate right and shifts larger than the bit length are
+    taken modulo it.
+
+    Args:
+        data: The bytes to rotate
+        num: Number of bit positions to rotate by
+
+    Returns:
+        The rotated bytes, the same length as data
+    """
+    nbits = len(data) * 8
+    if not nbits:
+        return b''
+    num %= nbits
+    if not num:
+        return bytes(data)
+    n = int.from_bytes(data, 'big')
+    n = ((n << num) | (n >> (nbits - num))) & ((1 << nbits) - 1)
+    return n.to_bytes(len(data), 'big')
+
+
+def rotate_right(data: bytes, num: int) -> bytes:
+    """
+    Rotate the bits of a byte string to the right.
+
+    Args:
+        data: The bytes to rotate
+        num: Number of bit positions to rotate by
+
+    Returns:
+        The rotated bytes, the same length as data
+    """
+    return rotate_left(data, -num)
+
+
+def rotate_window(window: bytes, shift: int) -> bytes:
+    """
+    Shift a window of bytes left by under 8 bits, pulling in its last byte.
+
+    Args:
+        window: The source bytes; the result is one byte shorter
+        shift: Number of bits to shift by, from 0 to 7
+
+    Returns:
+        The shifted bytes
+    """
+    m = len(window) - 1
+    n = int.from_bytes(window, 'big')
+    return (((n << shift) >> 8) & ((1 << (8 * m)) - 1)).to_bytes(m, 'big')
+
+
+def cyclic_bits_file(src_path: str, dst_path: str, num: int,
+                     chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """
+    Apply String.cyclic_bits to a whole file without loading it.
+
+    Args:
+        src_path: The file to read
+        dst_path: The file to write
+        num: Number of bit positions to shift
+        chunk_size: Number of output bytes computed per step
+
+    Returns:
+        The number of bytes written
+    """
+    return _rotate_file(src_path, dst_path, num, chunk_size)
+
+
+def decode_cyclic_bits_file(src_path: str, dst_path: str, num: int,
+                            chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """
+    Apply String.decode_cyclic_bits to a whole file without loading it.
+
+    Args:
+        src_path: The file to read
+        dst_path: The file to write
+        num: The same number used during encoding
+        chunk_size: Number of output bytes computed per step
+
+    Returns:
+        The number of bytes written
+    """
+    return _rotate_file(src_path, dst_path, -num, chunk_size)
+
+
+def _rotate_file(src_path, dst_path, num, chunk_size):
+    """Rotate a file left by num bits, dropping one trailing NUL byte."""
+    length = os.path.getsize(src_path)
+    with open(src_path, 'rb') as src, open(dst_path, 'wb') as dst:
+        if not length:
+            return 0
+        src_map = mmap.mmap(src.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            skip, shift = divmod(num % (8 * length), 8)
+            written = 0
+            for start in range(0, length, chunk_size):
+                end = min(start + chunk_size, length)
+                # Output bytes start..end need source bytes start+skip..end+skip.
+                first = (start + skip) % length
+                size = end - start + 1
+                window = src_map[first:first + size]
+                while len(window) < size:
+                    window += src_map[:size - len(window)]
+                chunk = rotate_window(window, shift)
+                if end == length and chunk[-1] == 0:
+                    chunk = chunk[:-1]
+                dst.write(chunk)
+                written += len(chunk)
+            return written
+        finally:
+            src_map.close()
@@ -0,0 +1,461 @@
+"""
+Incremental byte pair encoding engine.
+
+Keeps a pair-frequency index (a position set per pair) over a linked list of
+symbols, and after each merge updates only the neighbours of the merged
+occurrences instead of recounting the whole string. The learned rules and
+the encoded output are identical to the greedy algorithm built on
+:func:`string_encoding.string.count_pairs`:
+
+- pairs of two different characters count every occurrence;
+- runs of one repeated character count ``len // 2`` pairs, except that the
+  first run of that pair can count one more, depending on the ``skipped``
+  flag left behind by the pairs scanned before it;
+- ties go to the pair that appears first in the string.
+"""
+
+import collections
+import functools
+import heapq
+import itertools
+import operator
+
+
+class PairIndex:
+    """
+    Pair-frequency index over a doubly linked list of symbols.
+
+    Positions are the indices of the original characters, so the order of
+    positions is the order of the symbols in the current string. A pair is
+    identified by its left position.
+    """
+
+    def __init__(self, text: str, shards: list = None):
+        """
+        Build the index for a string.
+
+        Args:
+            text: The string to index
+            shards: index_shard results covering every pair of the string,
+                in string order, e.g. from parallel.index_shards; positions
+                can be any sequences. By default the string is indexed as one
+                shard.
+        """
+        n = len(text)
+        self.sym = list(text)
+        self.nxt = list(range(1, n)) + [-1]
+        self.prv = list(range(-1, n - 1))
+        self.occ = {}
+        self.first = {}
+        self.base = {}
+        self.heap = []
+
+        # Shards come in order and hold ascending positions, so the joined
+        # position lists are ascending too, which makes them valid heaps.
+        first = self.first
+        for shard in [index_shard(text)] if shards is None else shards:
+            for pair, positions in shard.items():
+                if pair in first:
+                    first[pair].extend(positions)
+                else:
+                    first[pair] = list(positions)
+
+        for pair, positions in first.items():
+            self.occ[pair] = set(positions)
+            if pair[0] == pair[1]:
+                # Non-overlapping matches count len // 2 pairs in every run.
+                self.base[pair] = text.count(pair)
+            else:
+                self.heap.append((-len(positions), positions[0], pair))
+        heapq.heapify(self.heap)
+
+    def text(self) -> str:
+        """Return the current string."""
+        out = []
+        i = 0 if self.sym else -1
+        while i != -1:
+            out.append(self.sym[i])
+            i = self.nxt[i]
+        return ''.join(out)
+
+    def first_pos(self, pair: str) -> int:
+        """Return the position of the first occurrence of a pair."""
+        positions = self.occ[pair]
+        heap = self.first[pair]
+        while heap[0] not in positions:
+            heapq.heappop(heap)
+        return heap[0]
+
+    def count(self, pair: str) -> int:
+        """
+        Return the count :func:`count_pairs` would give a pair.
+
+        Args:
+            pair: A pair present in the string
+
+        Returns:
+            The number of counted occurrences
+        """
+        if pair[0] != pair[1]:
+            return len(self.occ[pair])
+
+        # Only the first run can differ from len // 2, when its length is
+        # odd and the scan reaches it with the skipped flag set.
+        start = self.first_pos(pair)
+        length = self._run_length(start)
+        if length % 2 == 1 and self._skipped_before(start):
+            return self.base[pair] + 1
+        return self.base[pair]
+
+    def best(self) -> tuple or None:
+        """
+        Return the most frequent pair, breaking ties by first occurrence.
+
+        Returns:
+            A (pair, count) tuple, or None if the string has no pairs
+        """
+        best = None
+        heap = self.heap
+        while heap:
+            neg, pos, pair = heap[0]
+            if pair in self.occ and len(self.occ[pair]) == -neg and self.first_pos(pair) == pos:
+                best = (-neg, -pos, pair)
+                break
+            heapq.heappop(heap)
+
+        for pair, base in self.base.items():
+            if best is not None and base + 1 < best[0]:
+                continue
+            key = (self.count(pair), -self.first_pos(pair), pair)
+            if best is None or key[:2] > best[:2]:
+                best = key
+
+        if best is None:
+            return None
+        return best[2], best[0]
+
+    def merge(self, pair: str, symbol: str):
+        """
+        Replace every occurrence of a pair with a symbol, like str.replace.
+
+        Args:
+            pair: The pair to replace
+            symbol: The replacement character
+        """
+        sym, nxt, prv, occ = self.sym, self.nxt, self.prv, self.occ
+        positions = sorted(occ[pair])
+
+        dirty = []
+        for p in positions:
+            dirty.extend((prv[p], p, nxt[p], nxt[nxt[p]]))
+        self._remove_runs(dirty)
+
+        touched = set()
+        for p in positions:
+            current = occ.get(pair)
+            if current is None or p not in current:
+                continue
+            q = nxt[p]
+            a = prv[p]
+            b = nxt[q]
+            if a != -1:
+                self._discard(sym[a] + sym[p], a, touched)
+            self._discard(pair, p, touched)
+            if b != -1:
+                self._discard(sym[q] + sym[b], q, touched)
+
+            sym[p] = symbol
+            nxt[p] = b
+            if b != -1:
+                prv[b] = p
+            nxt[q] = prv[q] = -1
+
+            if a != -1:
+                self._add(sym[a] + symbol, a, touched)
+            if b != -1:
+                self._add(symbol + sym[b], p, touched)
+
+        self._add_runs([i for i in dirty if i != -1 and (i == 0 or prv[i] != -1)], set())
+        for key in touched:
+            if key in occ and key[0] != key[1]:
+                heapq.heappush(self.heap, (-len(occ[key]), self.first_pos(key), key))
+
+    def _add(self, pair, pos, touched):
+        """Record an occurrence of a pair."""
+        touched.add(pair)
+        if pair in self.occ:
+            self.occ[pair].add(pos)
+            heapq.heappush(self.first[pair], pos)
+        else:
+            self.occ[pair] = {pos}
+            self.first[pair] = [pos]
+
+    def _discard(self, pair, pos, touched):
+        """Forget an occurrence of a pair."""
+        touched.add(pair)
+        positions = self.occ[pair]
+        positions.discard(pos)
+        if not positions:
+            del self.occ[pair]
+            del self.first[pair]
+
+    def _run(self, i):
+        """Return the start and length of the run of equal symbols holding i."""
+        sym, nxt, prv = self.sym, self.nxt, self.prv
+        c = sym[i]
+        start = i
+        while prv[start] != -1 and sym[prv[start]] == c:
+            start = prv[start]
+        return start, self._run_length(start)
+
+    def _run_length(self, start):
+        """Return the length of the run of equal symbols starting at start."""
+        sym, nxt = self.sym, self.nxt
+        c = sym[start]
+        length = 1
+        i = nxt[start]
+        while i != -1 and sym[i] == c:
+            length += 1
+            i = nxt[i]
+        return length
+
+    def _runs(self, nodes, seen):
+        """Yield (pair, length) for each distinct run of 2+ symbols touching nodes."""
+        for i in nodes:
+            if i == -1 or i in seen:
+                continue
+            start, length = self._run(i)
+            j = start
+            for _ in range(length):
+                seen.add(j)
+                j = self.nxt[j]
+            if length > 1:
+                yield self.sym[start] * 2, length
+
+    def _add_runs(self, nodes, seen):
+        """Add the len // 2 contributions of the runs touching nodes."""
+        for pair, length in self._runs(nodes, seen):
+            self.base[pair] = self.base.get(pair, 0) + length // 2
+
+    def _remove_runs(self, nodes):
+        """Remove the len // 2 contributions of the runs touching nodes."""
+        for pair, length in self._runs(nodes, set()):
+            self.base[pair] -= length // 2
+            if not self.base[pair]:
+                del self.base[pair]
+
+    def _skipped_before(self, s):
+        """
+        Return the skipped flag count_pairs holds when it reaches position s.
+
+        The flag only changes at positions whose pair was already seen: it is
+        set when such a position is skipped inside a run and cleared when it
+        is counted.
+        """
+        sym, nxt, prv = self.sym, self.nxt, self.prv
+        j = prv[s]
+        while j != -1 and self.first_pos(sym[j] + sym[nxt[j]]) == j:
+            j = prv[j]
+        if j == -1:
+            return False
+
+        c = sym[j]
+        if prv[j] == -1 or sym[prv[j]] != c or sym[nxt[j]] != c:
+            return False
+
+        # j is inside a run: counts and skips alternate from the run start.
+        r, d = j, 0
+        while prv[r] != -1 and sym[prv[r]] == c:
+            r = prv[r]
+            d += 1
+        if self.first_pos(c * 2) != r:
+            return d % 2 == 1
+        return (d % 2 == 1) != self._skipped_before(r)
+
+
+def learn(text: str, symbols, shards: list = None) -> tuple:
+    """
+    Learn byte pair merges greedily and apply them.
+
+    Args:
+        text: The string to compress
+        symbols: An iterator of replacement characters, one per merge
+        shards: Optional index_shard results for the string, see PairIndex
+
+    Returns:
+        A tuple of the encoded string and the list of rules ("X = ab")
+    """
+    index = PairIndex(text, shards)
+    rules = []
+    best = index.best()
+    while best is not None and best[1] > 1:
+        symbol = next(symbols)
+        rules.append(f'{symbol} = {best[0]}')
+        index.merge(best[0], symbol)
+        best = index.best()
+    return index.text(), rules
+
+
+def index_shard(text: str, offset: int = 0) -> dict:
+    """
+    Collect the pair positions of one shard of a string for PairIndex.
+
+    Args:
+        text: The shard, including the one character that follows it
+        offset: The position of the shard in the whole string
+
+    Returns:
+        A dict mapping each pair to the ascending list of its positions in
+        the whole string, in order of first occurrence
+    """
+    positions = collections.defaultdict(list)
+    pairs = map(operator.add, text, itertools.islice(text, 1, None))
+    for pos, pair in enumerate(pairs, offset):
+        positions[pair].append(pos)
+    return dict(positions)
+
+
+def pair_counts(text: str, shards: list = None) -> dict:
+    """
+    Count adjacent pairs exactly like count_pairs.
+
+    Args:
+        text: The string to count
+        shards: Optional index_shard results for the string, see PairIndex
+
+    Returns:
+        A dict of pair counts, in order of first occurrence
+    """
+    index = PairIndex(text, shards)
+    # The index lists pairs in order of first occurrence.
+    return {pair: index.count(pair) for pair in index.occ}
+
+
+def parse_rule(rule: str) -> tuple:
+    """
+    Split a rule of the form "X = ab" into its symbol and pair.
+
+    Args:
+        rule: The rule string
+
+    Returns:
+        A (symbol, pair) tuple
+
+    Raises:
+        ValueError: If the rule is not in the "X = ab" format
+    """
+    if not isinstance(rule, str) or len(rule) != 6 or rule[1:4] != ' = ':
+        raise ValueError(f'invalid byte pair rule {rule!r}')
+    return rule[0], rule[4:]
+
+
+@functools.lru_cache(maxsize=128)
+def expansion_table(rules: tuple) -> dict or None:
+    """
+    Compile rules into a symbol -> fully expanded string table.
+
+    Expanding every symbol of an encoded string through the table in one
+    pass gives the same result as undoing the rules one by one in reverse.
+
+    Args:
+        rules: Rules in the "X = ab" format, in the order they were learned
+
+    Returns:
+        A str.translate table mapping symbol code points to their expansion,
+        or None if any rule is not in the "X = ab" format
+    """
+    expansions = {}
+    for rule in rules:
+        try:
+            symbol, pair = parse_rule(rule)
+        except ValueError:
+            return None
+        expansions[symbol] = ''.join(expansions.get(c, c) for c in pair)
+    return {ord(symbol): text for symbol, text in expansions.items()}
+
+
+def compile_merges(merges: list) -> dict:
+    """
+    Build the pair lookup table used by apply_merges.
+
+    Args:
+        merges: (pair, symbol) tuples in the order they were learned
+
+    Returns:
+        A dict mapping each pair to the ascending list of ranks it was
+        learned at
+    """
+    table = {}
+    for rank, (pair, symbol) in enumerate(merges):
+        table.setdefault(pair, []).append(rank)
+    return table
+
+
+def apply_merges(text: str, merges: list, table: dict = None) -> str:
+    """
+    Apply learned merges to a string in a single indexed pass.
+
+    The result is the same as calling ``text.replace(pair, symbol)`` for each
+    merge in order, but each merge only visits the positions where its pair
+    actually occurs.
+
+    Args:
+        text: The string to encode
+        merges: (pair, symbol) tuples in the order they were learned
+        table: The output of compile_merges(merges), if already built
+
+    Returns:
+        The encoded string
+    """
+    n = len(text)
+    if n < 2 or not merges:
+        return text
+    if table is None:
+        table = compile_merges(merges)
+
+    sym = list(text)
+    nxt = list(range(1, n)) + [-1]
+    prv = list(range(-1, n - 1))
+    occ = {}
+    for i in range(n - 1):
+        found = table.get(text[i] + text[i + 1])
+        if found is not None:
+            occ.setdefault(found[0], set()).add(i)
+
+    ranks = list(occ)
+    heapq.heapify(ranks)
+    while ranks:
+        rank = heapq.heappop(ranks)
+        positions = occ.pop(rank)
+        pair, symbol = merges[rank]
+        for p in sorted(positions):
+            q = nxt[p]
+            if sym[p] is None or q == -1 or sym[p] + sym[q] != pair:
+                continue
+            a, b = prv[p], nxt[q]
+            sym[p] = symbol
+            sym[q] = None
+            nxt[p] = b
+            if b != -1:
+                prv[b] = p
+                _index_pair(occ, ranks, table, symbol + sym[b], p, rank)
+            if a != -1:
+                _index_pair(occ, ranks, table, sym[a] + symbol, a, rank)
+
+    out = []
+    i = 0
+    while i != -1:
+        out.append(sym[i])
+        i = nxt[i]
+    return ''.join(out)
+
+
+def _index_pair(occ, ranks, table, pair, pos, rank):
+    """Queue a pair created by a merge if a later merge applies to it."""
+    for later in table.get(pair, ()):
+        if later > rank:
+            if later not in occ:
+                occ[later] = set()
+                heapq.heappush(ranks, later)
+            occ[later].add(pos)
+            return
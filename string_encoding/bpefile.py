@@ -0,0 +1,208 @@
+"""
+Compact binary container for byte pair encoded payloads.
+
+Layout (all integers big-endian), version 1::
+
+    magic       4 bytes   b'SEBP'
+    version     1 byte    1
+    flags       1 byte    0 (reserved)
+    rule count  2 bytes
+    body length 8 bytes
+    rules       3 bytes per rule: symbol, first and second char of the pair
+    body        the encoded text, one byte per character
+
+Every character of a byte pair encoded payload is at most 255, so rules and
+body are stored as single bytes. The reader memory-maps the file and exposes
+the body as a zero-copy ``memoryview``.
+"""
+
+import mmap
+import struct
+
+from . import bpe
+
+MAGIC = b'SEBP'
+VERSION = 1
+HEADER = struct.Struct('>4sBBHQ')
+
+
+def pack_rules(rules: list) -> bytes:
+    """
+    Pack rules into 3 bytes each.
+
+    Args:
+        rules: Rules in the "X = ab" format
+
+    Returns:
+        The packed rule table
+
+    Raises:
+        ValueError: If a rule is malformed or uses characters above 255
+    """
+    out = bytearray()
+    for rule in rules:
+        symbol, pair = bpe.parse_rule(rule)
+        try:
+            out += (symbol + pair).encode('latin-1')
+        except UnicodeEncodeError:
+            raise ValueError(f'byte pair rule {rule!r} uses characters above 255')
+    return bytes(out)
+
+
+def unpack_rules(buf) -> list:
+    """
+    Unpack a rule table written by pack_rules.
+
+    Args:
+        buf: A bytes-like object holding 3 bytes per rule
+
+    Returns:
+        Rules in the "X = ab" format
+    """
+    text = bytes(buf).decode('latin-1')
+    return [f'{text[i]} = {text[i + 1:i + 3]}' for i in range(0, len(text), 3)]
+
+
+def dumps(text: str, rules: list) -> bytes:
+    """
+    Serialize an encoded payload and its rules.
+
+    Args:
+        text: The encoded text
+        rules: The rules it was encoded with
+
+    Returns:
+        The container bytes
+
+    Raises:
+        ValueError: If the rules or text cannot be stored
+    """
+    if len(rules) > 0xFFFF:
+        raise ValueError('too many byte pair rules')
+    try:
+        body = text.encode('latin-1')
+    except UnicodeEncodeError:
+        raise ValueError('byte pair payload uses characters above 255')
+    header = HEADER.pack(MAGIC, VERSION, 0, len(rules), len(body))
+    return header + pack_rules(rules) + body
+
+
+def loads(buf) -> tuple:
+    """
+    Deserialize a container.
+
+    Args:
+        buf: A bytes-like object (bytes, memoryview, mmap, ...)
+
+    Returns:
+        A tuple of the encoded text and its rules
+
+    Raises:
+        ValueError: If the buffer is not a valid container
+    """
+    rules, start, end = _parse(buf)
+    return bytes(buf[start:end]).decode('latin-1'), rules
+
+
+def dump(text: str, rules: list, path: str):
+    """
+    Write an encoded payload and its rules to a file.
+
+    Args:
+        text: The encoded text
+        rules: The rules it was encoded with
+        path: The file to write
+
+    Raises:
+        ValueError: If the rules or text cannot be stored
+    """
+    data = dumps(text, rules)
+    with open(path, 'wb') as fh:
+        fh.write(data)
+
+
+def _parse(buf) -> tuple:
+    """Validate the header and return the rules and the body bounds."""
+    if len(buf) < HEADER.size:
+        raise ValueError('truncated byte pair container')
+    magic, version, flags, count, length = HEADER.unpack_from(buf)
+    if magic != MAGIC:
+        raise ValueError('not a byte pair container')
+    if version != VERSION:
+        raise ValueError(f'unsupported byte pair container version {version}')
+    start = HEADER.size + 3 * count
+    end = start + length
+    if len(buf) < end:
+        raise ValueError('truncated byte pair container')
+    return unpack_rules(buf[HEADER.size:start]), start, end
+
+
+class BytePairFile:
+    """
+    A memory-mapped byte pair container.
+
+    The body is not copied when the file is opened; :meth:`iter_decode`
+    decodes it chunk by chunk straight from the mapping.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open and validate a container file.
+
+        Args:
+            path: The file to open
+
+        Raises:
+            ValueError: If the file is not a valid container
+        """
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError('truncated byte pair container')
+        try:
+            self.rules, start, end = _parse(self._map)
+        except ValueError:
+            self.close()
+            raise
+        self.body = memoryview(self._map)[start:end]
+
+    def text(self) -> str:
+        """Return the encoded text."""
+        return bytes(self.body).decode('latin-1')
+
+    def iter_decode(self, chunk_size: int = 1 << 16):
+        """
+        Decode the body piece by piece.
+
+        Args:
+            chunk_size: Number of encoded bytes to expand per piece
+
+        Yields:
+            Pieces of the decoded text, in order
+
+        Raises:
+            ValueError: If the container has no rules
+        """
+        if not self.rules:
+            raise ValueError('byte pair container has no rules')
+        table = bpe.expansion_table(tuple(self.rules))
+        for index in range(0, len(self.body), chunk_size):
+            yield bytes(self.body[index:index + chunk_size]).decode('latin-1').translate(table)
+
+    def close(self):
+        """Release the mapping and the file."""
+        body = self.__dict__.pop('body', None)
+        if body is not None:
+            body.release()
+        if getattr(self, '_map', None) is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,172 @@
+"""
+Cheap assembly of large Strings from many parts.
+
+Concatenating Strings with ``+`` copies the whole result every time. A
+:class:`StringBuilder` only collects references to its parts and joins them
+once, when :meth:`StringBuilder.build` is called::
+
+    doc = StringBuilder()
+    for record in records:
+        doc.append(record).append('\n')
+    encoded = doc.base64()      # encoded straight from the parts
+    text = doc.build()          # one join
+
+Base64 and character shifts run over the parts through a one-step
+:class:`~string_encoding.pipeline.Pipeline`, so the input is never joined
+into one String. The other methods need the whole text and build it first.
+"""
+
+from .pipeline import Pipeline
+from .string import String, valid_num_check
+
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+
+class StringBuilder:
+    """
+    A growable sequence of string parts with the String encoding methods.
+
+    Each encoding method returns the same String as calling it on build(),
+    except that errors from the streamed methods (base64, decode_base64,
+    cyclic_chars and decode_cyclic_chars) carry the failing chunk instead
+    of the whole text.
+    """
+
+    def __init__(self, parts=(), rules: list = None, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """
+        Initialize a builder.
+
+        Args:
+            parts: Initial str parts
+            rules: Byte pair rules for the built String, used by decode_byte_pair
+            chunk_size: Number of characters the streamed methods handle at a time
+        """
+        self.rules = rules
+        self.chunk_size = chunk_size
+        self._parts = []
+        self._length = 0
+        self.extend(parts)
+
+    def append(self, part: str) -> 'StringBuilder':
+        """
+        Add a part to the end, without copying it.
+
+        Args:
+            part: A str or String
+
+        Returns:
+            This builder
+
+        Raises:
+            TypeError: If part is not a str
+        """
+        if not isinstance(part, str):
+            raise TypeError(f'can only append str, not {type(part).__name__}')
+        if part:
+            self._parts.append(part)
+            self._length += len(part)
+        return self
+
+    def extend(self, parts) -> 'StringBuilder':
+        """
+        Add several parts to the end.
+
+        Args:
+            parts: An iterable of str parts
+
+        Returns:
+            This builder
+        """
+        for part in parts:
+            self.append(part)
+        return self
+
+    def build(self) -> String:
+        """
+        Join the parts into one String.
+
+        The joined text replaces the parts, so building again is free.
+
+        Returns:
+            A new String instance, carrying the builder's rules if it has any
+        """
+        text = ''.join(self._parts)
+        self._parts = [text] if text else []
+        return String(text, self.rules)
+
+    def base64(self) -> String:
+        """Encode the parts with String.base64."""
+        return self._stream('base64')
+
+    def decode_base64(self) -> String:
+        """Decode the parts with String.decode_base64."""
+        return self._stream('decode_base64')
+
+    def cyclic_chars(self, num: int) -> String:
+        """Shift the parts with String.cyclic_chars."""
+        return self._stream('cyclic_chars', num)
+
+    def decode_cyclic_chars(self, num: int) -> String:
+        """Shift the parts back with String.decode_cyclic_chars."""
+        return self._stream('decode_cyclic_chars', num)
+
+    def byte_pair_encoding(self) -> String:
+        """Build the String and run String.byte_pair_encoding on it."""
+        return self.build().byte_pair_encoding()
+
+    def decode_byte_pair(self) -> String:
+        """Build the String and run String.decode_byte_pair with the builder's rules."""
+        return self.build().decode_byte_pair()
+
+    def cyclic_bits(self, num: int) -> String or None:
+        """Build the String and run String.cyclic_bits on it."""
+        return self.build().cyclic_bits(num)
+
+    def decode_cyclic_bits(self, num: int) -> String or None:
+        """Build the String and run String.decode_cyclic_bits on it."""
+        return self.build().decode_cyclic_bits(num)
+
+    def histogram_of_chars(self) -> dict:
+        """Build the String and run String.histogram_of_chars on it."""
+        return self.build().histogram_of_chars()
+
+    def _stream(self, name: str, *args) -> String:
+        """Run a method over batches of the parts, or on build() where that differs."""
+        # Empty input and shift numbers that are not plain ints have their
+        # own results in the String methods.
+        if not self._parts or (args and not (type(args[0]) is int and valid_num_check(args[0]) == args[0])):
+            return getattr(self.build(), name)(*args)
+        pipeline = Pipeline(((name, args),))
+        return String(''.join(pipeline.iter_run(_batches(self._parts, self.chunk_size))))
+
+    def __iadd__(self, part):
+        if not isinstance(part, str):
+            return NotImplemented
+        return self.append(part)
+
+    def __len__(self):
+        return self._length
+
+    def __str__(self):
+        return ''.join(self._parts)
+
+    def __repr__(self):
+        return f'StringBuilder(<{len(self._parts)} parts, {self._length} chars>)'
+
+
+def _batches(parts: list, size: int):
+    """Yield the parts joined into pieces of at least size characters, where small."""
+    batch = []
+    length = 0
+    for part in parts:
+        if len(part) >= size and not batch:
+            yield part
+            continue
+        batch.append(part)
+        length += len(part)
+        if length >= size:
+            yield ''.join(batch)
+            batch = []
+            length = 0
+    if batch:
+        yield ''.join(batch)
@@ -0,0 +1,158 @@
+"""
+Opt-in, size-bounded cache of String method results.
+
+Repeated payloads (config blobs, templated messages) are common, so the
+String encoders can look their results up by operation, parameters and a
+hash of the content instead of recomputing them. The cache is off until
+:func:`enable` is called::
+
+    from string_encoding import cache
+
+    cache.enable(max_bytes=64 << 20)
+    ...
+    print(cache.active.stats())
+
+Entries are evicted least recently used first once their total size exceeds
+``max_bytes``. Byte pair entries keep the learned ``rules``. All operations
+are protected by a lock, so one cache can be shared between threads.
+"""
+
+import collections
+import hashlib
+import sys
+import threading
+
+DEFAULT_MAX_BYTES = 64 << 20
+
+CacheStats = collections.namedtuple('CacheStats', 'hits misses evictions entries size max_bytes')
+
+# The cache the String methods use, or None when caching is off.
+active = None
+
+
+class ResultCache:
+    """
+    A thread-safe LRU cache of encoder results with byte-based eviction.
+
+    Keys are (operation, parameters, content hash) tuples built by
+    :func:`content_key`; values are (text, rules) tuples.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_bytes: Maximum total size of the cached results
+
+        Raises:
+            ValueError: If max_bytes is negative
+        """
+        if max_bytes < 0:
+            raise ValueError('max_bytes must not be negative')
+        self.max_bytes = max_bytes
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key: tuple) -> tuple or None:
+        """
+        Look up a result and mark it as recently used.
+
+        Args:
+            key: A key built by content_key
+
+        Returns:
+            The cached (text, rules) tuple, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[0]
+
+    def put(self, key: tuple, text: str, rules: tuple = None):
+        """
+        Store a result, evicting the least recently used ones as needed.
+
+        Results larger than max_bytes are not stored.
+
+        Args:
+            key: A key built by content_key
+            text: The result string
+            rules: The byte pair rules of the result, if any
+        """
+        size = sys.getsizeof(text) + sum(sys.getsizeof(rule) for rule in rules or ())
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= old[1]
+            self._entries[key] = ((text, rules), size)
+            self._size += size
+            while self._size > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._size -= evicted
+                self._evictions += 1
+
+    def stats(self) -> CacheStats:
+        """Return the hit, miss and eviction counts and the current size."""
+        with self._lock:
+            return CacheStats(self._hits, self._misses, self._evictions,
+                              len(self._entries), self._size, self.max_bytes)
+
+    def clear(self):
+        """Drop every entry and reset the statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._size = self._hits = self._misses = self._evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __repr__(self):
+        return f'ResultCache(max_bytes={self.max_bytes})'
+
+
+def content_key(op: str, params: tuple, text: str) -> tuple:
+    """
+    Build a cache key from an operation, its parameters and the content.
+
+    Args:
+        op: The String method name
+        params: Its hashable parameters
+        text: The content
+
+    Returns:
+        A tuple holding a 128-bit BLAKE2b digest instead of the content
+    """
+    digest = hashlib.blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+    return op, params, len(text), digest
+
+
+def enable(max_bytes: int = DEFAULT_MAX_BYTES) -> ResultCache:
+    """
+    Turn on result caching for the String methods with a new cache.
+
+    Args:
+        max_bytes: Maximum total size of the cached results
+
+    Returns:
+        The new active ResultCache
+    """
+    global active
+    active = ResultCache(max_bytes)
+    return active
+
+
+def disable():
+    """Turn result caching off and drop the active cache."""
+    global active
+    active = None
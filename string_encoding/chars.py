@@ -0,0 +1,173 @@
+"""
+Character tables shared by the String encoders.
+
+Holds the character classification table used for histograms, byte pair
+group detection and Base64 control code filtering, the precomputed
+``str.translate`` tables for the cyclic character shift, and a fast scan for
+characters outside the printable ASCII range the shift works on.
+"""
+
+import collections
+import functools
+import re
+
+# Character classes, numbered like the lists returned by priority().
+PUNCT, DIGIT, UPPER, LOWER, HIGH, CONTROL, SPACE, NONE = range(8)
+
+
+def _classify(i: int) -> int:
+    """Return the class of a code point from 0 to 255."""
+    if 48 <= i <= 57:
+        return DIGIT
+    if 65 <= i <= 90:
+        return UPPER
+    if 97 <= i <= 122:
+        return LOWER
+    if 128 <= i <= 255:
+        return HIGH
+    if i < 32 or i == 127:
+        return CONTROL
+    if i == 32:
+        return SPACE
+    if i == 123:  # '{' is in none of the priority groups
+        return NONE
+    return PUNCT
+
+
+# Class of every code point from 0 to 255, built once at import.
+CHAR_CLASS = bytes(_classify(i) for i in range(256))
+
+# Histogram bin for each class; NONE (and anything above 255) is not counted.
+HISTOGRAM_BINS = {
+    CONTROL: 'control code',
+    DIGIT: 'digits',
+    UPPER: 'upper',
+    LOWER: 'lower',
+    PUNCT: 'other printable',
+    SPACE: 'other printable',
+    HIGH: 'higher than 128',
+}
+
+
+def char_class(c: str) -> int:
+    """
+    Return the class of a character.
+
+    Args:
+        c: A single character
+
+    Returns:
+        One of the class constants; NONE for characters above 255
+    """
+    i = ord(c)
+    if i > 255:
+        return NONE
+    return CHAR_CLASS[i]
+
+
+def class_members(cls: int) -> list:
+    """
+    List the code points of a class, in ascending order.
+
+    Args:
+        cls: One of the class constants
+
+    Returns:
+        A new list of code points from 0 to 255
+    """
+    return [i for i in range(256) if CHAR_CLASS[i] == cls]
+
+
+def class_counts(text: str) -> list:
+    """
+    Count the characters of each class in a string.
+
+    Args:
+        text: The string to count
+
+    Returns:
+        A list indexed by class; characters above 255 are counted as NONE
+    """
+    counts = [0] * 8
+    data = text.encode('latin-1', 'ignore')
+    for i, n in collections.Counter(data).items():
+        counts[CHAR_CLASS[i]] += n
+    counts[NONE] += len(text) - len(data)
+    return counts
+
+
+# Printable ASCII: the 95 characters cyclic_chars shifts between.
+FIRST_PRINTABLE = 32
+LAST_PRINTABLE = 126
+PRINTABLE_COUNT = LAST_PRINTABLE - FIRST_PRINTABLE + 1
+
+_UNPRINTABLE = re.compile('[^ -~]')
+_UNPRINTABLE_BYTES = re.compile(b'[^ -~]')
+_ABOVE_LATIN1 = re.compile('[^\x00-\xff]')
+
+
+def first_unprintable(text: str) -> int or None:
+    """
+    Find the first character outside the printable ASCII range (32-126).
+
+    Args:
+        text: The string, or bytes-like object, to scan
+
+    Returns:
+        The index of the first such character, or None if there is none
+    """
+    if isinstance(text, str):
+        match = _UNPRINTABLE.search(text)
+    else:
+        match = _UNPRINTABLE_BYTES.search(text)
+    if match is None:
+        return None
+    return match.start()
+
+
+def first_above_latin1(text: str) -> int or None:
+    """
+    Find the first character above 255, which has no single-byte form.
+
+    Args:
+        text: The string to scan
+
+    Returns:
+        The index of the first such character, or None if there is none
+    """
+    match = _ABOVE_LATIN1.search(text)
+    if match is None:
+        return None
+    return match.start()
+
+
+@functools.lru_cache(maxsize=32)
+def cyclic_table(shift: int) -> dict:
+    """
+    Build the translate table that shifts printable ASCII cyclically.
+
+    Args:
+        shift: The shift, from 0 to 94
+
+    Returns:
+        A str.translate table for the 95 printable characters
+    """
+    return {
+        c: FIRST_PRINTABLE + (c - FIRST_PRINTABLE + shift) % PRINTABLE_COUNT
+        for c in range(FIRST_PRINTABLE, LAST_PRINTABLE + 1)
+    }
+
+
+@functools.lru_cache(maxsize=32)
+def cyclic_byte_table(shift: int) -> bytes:
+    """
+    Build the bytes.translate version of cyclic_table.
+
+    Args:
+        shift: The shift, from 0 to 94
+
+    Returns:
+        A 256-byte table that shifts the 95 printable characters
+    """
+    table = cyclic_table(shift)
+    return bytes(table.get(i, i) for i in range(256))
@@ -0,0 +1,363 @@
+"""
+Registration of the String encodings with the stdlib ``codecs`` machinery.
+
+Importing ``string_encoding`` registers three families of text encodings:
+
+- ``se-base64``: the unpadded Base64 of :meth:`String.base64`;
+- ``se-cyclic-chars-N``: :meth:`String.cyclic_chars` with number N;
+- ``se-cyclic-bits-N``: :meth:`String.cyclic_bits` with number N.
+
+They work with ``str.encode``/``bytes.decode``, ``codecs.encode``/``decode``,
+``codecs.iterencode``/``iterdecode`` and ``open``/``io.TextIOWrapper``::
+
+    with open(path, encoding='se-cyclic-chars-7') as fh:
+        for line in fh:
+            ...
+
+``io.TextIOWrapper`` never makes the final call of its encoder, so an
+incremental encoder that held text back until then would silently drop it.
+The ``se-base64`` and ``se-cyclic-bits-N`` encoders therefore hold nothing
+back by default: a call that is not final raises UnicodeEncodeError if its
+text cannot be encoded completely, i.e. text whose length is not a multiple
+of 3 for ``se-base64``, and any text for ``se-cyclic-bits-N``, which rotates
+the whole text. Callers that always make the final call can pass
+``buffered=True`` to carry the rest over instead::
+
+    data = b''.join(codecs.iterencode(chunks, 'se-base64', buffered=True))
+
+The stream coders of ``codecs.getreader``/``getwriter`` work the same way:
+readers decode whole groups and finish at the end of the stream, and a
+writer ends its output at a write that leaves text to hold back (for
+``se-cyclic-bits-N``, any write), raising UnicodeEncodeError on more text.
+
+Reading these encodings through ``open`` is fully supported; write files
+with ``codecs.iterencode``, :mod:`string_encoding.stream` or
+:func:`string_encoding.bits.cyclic_bits_file`.
+
+Only printable ASCII can be shifted by ``se-cyclic-chars-N``. Other
+characters, such as newlines, go to the ``errors`` handler; the
+``se-passthrough`` handler registered here keeps them unchanged.
+"""
+
+import codecs
+import functools
+import re
+
+from . import b64, bits, chars
+from .string import str_2_bytes, strip_last_nul
+
+# codecs.lookup lowercases names and turns '-' into '_' before searching.
+_NAME = re.compile(r'se_(?:(base64)|(cyclic_chars|cyclic_bits)_(\d+))$')
+
+_UNPRINTABLE = re.compile('[^ -~]+')
+_UNPRINTABLE_BYTES = re.compile(b'[^ -~]+')
+
+_registered = False
+
+
+def register():
+    """Register the search function and error handler, once."""
+    global _registered
+    if not _registered:
+        codecs.register(search)
+        codecs.register_error('se-passthrough', passthrough)
+        _registered = True
+
+
+def search(name: str) -> codecs.CodecInfo or None:
+    """
+    Find the codec for an encoding name, for codecs.register.
+
+    Args:
+        name: The normalized encoding name, e.g. "se_cyclic_chars_7"
+
+    Returns:
+        A CodecInfo, or None if the name is not one of ours
+    """
+    match = _NAME.match(name.replace('-', '_'))
+    if match is None:
+        return None
+    if match.group(1):
+        return _base64_info()
+    return _numbered_info(match.group(2), int(match.group(3)))
+
+
+def passthrough(exc: UnicodeError) -> tuple:
+    """
+    Error handler that keeps the offending characters unchanged.
+
+    Args:
+        exc: The UnicodeEncodeError or UnicodeDecodeError raised by a codec
+
+    Returns:
+        The replacement and the position to resume at
+    """
+    if isinstance(exc, UnicodeEncodeError):
+        return exc.object[exc.start:exc.end], exc.end
+    if isinstance(exc, UnicodeDecodeError):
+        return bytes(exc.object[exc.start:exc.end]).decode('latin-1'), exc.end
+    raise exc
+
+
+@functools.lru_cache(maxsize=None)
+def _base64_info() -> codecs.CodecInfo:
+    """Build the se-base64 codec."""
+    name = 'se-base64'
+
+    def encode(text, errors='strict'):
+        return b64.encode_bytes(str_2_bytes(text)), len(text)
+
+    def decode(data, errors='strict'):
+        return _decode_base64(name, bytes(data)), len(data)
+
+    # A partial group is only carried over with buffered=True, see the module docstring.
+    class IncrementalEncoder(codecs.IncrementalEncoder):
+        def __init__(self, errors='strict', buffered=False):
+            super().__init__(errors)
+            self.buffered = buffered
+            self.carry = b''
+
+        def encode(self, text, final=False):
+            data = self.carry + str_2_bytes(text)
+            full = len(data) if final else len(data) - len(data) % 3
+            if full < len(data) and not self.buffered:
+                raise UnicodeEncodeError(name, text, len(text) - (len(data) - full), len(text),
+                                         'a partial group needs buffered=True and a final call')
+            self.carry = data[full:]
+            return b64.encode_bytes(data[:full])
+
+        def pending(self):
+            """Return True if text is held back for the final call."""
+            return bool(self.carry)
+
+        def reset(self):
+            self.carry = b''
+
+    class IncrementalDecoder(codecs.IncrementalDecoder):
+        def __init__(self, errors='strict'):
+            super().__init__(errors)
+            self.carry = b''
+
+        def decode(self, data, final=False):
+            data = self.carry + bytes(data).translate(None, b64.STRIP_BYTES)
+            full = len(data) if final else len(data) - len(data) % 4
+            self.carry = data[full:]
+            return _decode_base64(name, data[:full])
+
+        def reset(self):
+            self.carry = b''
+
+        def getstate(self):
+            return self.carry, 0
+
+        def setstate(self, state):
+            self.carry = state[0]
+
+    return _codec_info(name, encode, decode, IncrementalEncoder, IncrementalDecoder)
+
+
+def _decode_base64(name: str, data: bytes) -> str:
+    """
+    Decode Base64 bytes with the checks of String.decode_base64.
+
+    Unlike decode_base64, empty input decodes to an empty string, so that
+    empty files can be read.
+    """
+    if not data.translate(None, b64.STRIP_BYTES):
+        return ''
+    raw = b64.decode_bytes(data)
+    if raw is None or max(raw, default=0) > 127:  # bytes.isascii needs 3.7
+        raise UnicodeDecodeError(name, data, 0, len(data), 'cannot be decode with base 64')
+    return raw.decode('ascii')
+
+
+@functools.lru_cache(maxsize=64)
+def _numbered_info(kind: str, num: int) -> codecs.CodecInfo:
+    """Build an se-cyclic-chars-N or se-cyclic-bits-N codec."""
+    name = f"se-{kind.replace('_', '-')}-{num}"
+    if kind == 'cyclic_chars':
+        encode, decode = _cyclic_chars_coders(name, num)
+
+        # Every character is shifted on its own, so chunks need no state;
+        # buffered is accepted like by the other se-* encoders.
+        class IncrementalEncoder(codecs.IncrementalEncoder):
+            def __init__(self, errors='strict', buffered=False):
+                super().__init__(errors)
+
+            def encode(self, text, final=False):
+                return encode(text, self.errors)[0]
+
+            def pending(self):
+                return False
+
+        class IncrementalDecoder(codecs.IncrementalDecoder):
+            def decode(self, data, final=False):
+                return decode(data, self.errors)[0]
+    else:
+        encode, decode = _cyclic_bits_coders(num)
+
+        # The rotation wraps around the whole text: with buffered=True it is
+        # collected until the final call, see the module docstring.
+        class IncrementalEncoder(codecs.IncrementalEncoder):
+            def __init__(self, errors='strict', buffered=False):
+                super().__init__(errors)
+                self.buffered = buffered
+                self.pieces = []
+
+            def encode(self, text, final=False):
+                if not final and text and not self.buffered:
+                    raise UnicodeEncodeError(name, text, 0, len(text),
+                                             'text before the final call needs buffered=True')
+                self.pieces.append(text)
+                if not final:
+                    return b''
+                text, self.pieces = ''.join(self.pieces), []
+                return encode(text, self.errors)[0]
+
+            def pending(self):
+                return any(self.pieces)
+
+            def reset(self):
+                self.pieces = []
+
+        class IncrementalDecoder(codecs.IncrementalDecoder):
+            def __init__(self, errors='strict'):
+                super().__init__(errors)
+                self.pieces = []
+
+            def decode(self, data, final=False):
+                self.pieces.append(bytes(data))
+                if not final:
+                    return ''
+                data, self.pieces = b''.join(self.pieces), []
+                return decode(data, self.errors)[0]
+
+            def reset(self):
+                self.pieces = []
+
+            def getstate(self):
+                return b''.join(self.pieces), 0
+
+            def setstate(self, state):
+                self.pieces = [state[0]]
+
+    return _codec_info(name, encode, decode, IncrementalEncoder, IncrementalDecoder)
+
+
+def _cyclic_chars_coders(name: str, num: int) -> tuple:
+    """Return the stateless encode and decode functions of se-cyclic-chars-N."""
+    shift = num % chars.PRINTABLE_COUNT
+    encode_table = chars.cyclic_table(shift)
+    decode_table = chars.cyclic_byte_table(-shift % chars.PRINTABLE_COUNT)
+
+    def encode(text, errors='strict'):
+        out = []
+        pos = 0
+        for match in _UNPRINTABLE.finditer(text):
+            if match.start() < pos:
+                continue
+            out.append(text[pos:match.start()].translate(encode_table).encode('ascii'))
+            reason = f"can't use cyclic chars with number {num}"
+            exc = UnicodeEncodeError(name, text, match.start(), match.end(), reason)
+            replacement, pos = codecs.lookup_error(errors)(exc)
+            out.append(replacement.encode('latin-1') if isinstance(replacement, str) else replacement)
+        out.append(text[pos:].translate(encode_table).encode('ascii'))
+        return b''.join(out), len(text)
+
+    def decode(data, errors='strict'):
+        data = bytes(data)
+        out = []
+        pos = 0
+        for match in _UNPRINTABLE_BYTES.finditer(data):
+            if match.start() < pos:
+                continue
+            out.append(data[pos:match.start()].translate(decode_table).decode('ascii'))
+            reason = f"can't use decode cyclic chars with number {num}"
+            exc = UnicodeDecodeError(name, data, match.start(), match.end(), reason)
+            replacement, pos = codecs.lookup_error(errors)(exc)
+            out.append(replacement)
+        out.append(data[pos:].translate(decode_table).decode('ascii'))
+        return ''.join(out), len(data)
+
+    return encode, decode
+
+
+def _cyclic_bits_coders(num: int) -> tuple:
+    """Return the stateless encode and decode functions of se-cyclic-bits-N."""
+    def encode(text, errors='strict'):
+        return strip_last_nul(bits.rotate_left(str_2_bytes(text), num)), len(text)
+
+    def decode(data, errors='strict'):
+        return strip_last_nul(bits.rotate_right(bytes(data), num)).decode('latin-1'), len(data)
+
+    return encode, decode
+
+
+def _codec_info(name, encode, decode, incremental_encoder, incremental_decoder) -> codecs.CodecInfo:
+    """Assemble a CodecInfo, with stream classes built on the incremental coders."""
+    class StreamWriter(codecs.StreamWriter):
+        # A write the encoder cannot continue from, e.g. a partial Base64
+        # group, is encoded as final; writing more after it is an error.
+        def __init__(self, stream, errors='strict'):
+            super().__init__(stream, errors)
+            self.encoder = incremental_encoder(errors, buffered=True)
+            self.finished = False
+
+        def encode(self, text, errors='strict'):
+            if self.finished and text:
+                raise UnicodeEncodeError(name, text, 0, len(text),
+                                         'the stream was finished by an earlier write')
+            data = self.encoder.encode(text)
+            if self.encoder.pending():
+                data += self.encoder.encode('', final=True)
+                self.finished = True
+            return data, len(text)
+
+        def reset(self):
+            super().reset()
+            self.encoder.reset()
+            self.finished = False
+
+    class StreamReader(codecs.StreamReader):
+        # codecs.StreamReader.read never tells decode that the stream ended,
+        # so read drives the incremental decoder and finishes it at EOF.
+        def __init__(self, stream, errors='strict'):
+            super().__init__(stream, errors)
+            self.decoder = incremental_decoder(errors)
+
+        def decode(self, data, errors='strict', final=False):
+            return self.decoder.decode(data, final), len(data)
+
+        def read(self, size=-1, chars=-1, firstline=False):
+            if self.linebuffer:
+                self.charbuffer = ''.join(self.linebuffer)
+                self.linebuffer = None
+            if chars < 0:
+                chars = size
+            while chars < 0 or len(self.charbuffer) < chars:
+                data = self.stream.read() if size < 0 else self.stream.read(size)
+                self.charbuffer += self.decode(data, self.errors, final=not data)[0]
+                if not data:
+                    break
+            if chars < 0:
+                result, self.charbuffer = self.charbuffer, ''
+            else:
+                result, self.charbuffer = self.charbuffer[:chars], self.charbuffer[chars:]
+            return result
+
+        def reset(self):
+            super().reset()
+            self.decoder.reset()
+
+    return codecs.CodecInfo(
+        name=name,
+        encode=encode,
+        decode=decode,
+        incrementalencoder=incremental_encoder,
+        incrementaldecoder=incremental_decoder,
+        streamwriter=StreamWriter,
+        streamreader=StreamReader,
+    )
+
+
+register()
@@ -0,0 +1,327 @@
+"""
+Character-class histograms over strings, byte buffers and codepoint arrays.
+
+:class:`CharHistogram` is the result type of :meth:`String.histogram_of_chars`.
+It is a plain dict of the six bins, so it compares equal to the dicts the
+method has always returned, and it can be added to other histograms so that
+per-chunk or per-worker results combine into one.
+
+:class:`RollingCharHistogram` keeps the bins over a sliding window of a
+stream, for monitoring how the mix of characters changes over time.
+
+NumPy is optional. When it is installed, :func:`histogram` can compute the
+bins with one ``bincount`` over a class lookup table.
+"""
+
+import collections
+import time
+
+from . import chars
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is an optional dependency
+    np = None
+
+BINS = ('control code', 'digits', 'upper', 'lower', 'other printable', 'higher than 128')
+
+
+class CharHistogram(dict):
+    """
+    A mergeable histogram of character classes.
+
+    Holds the same six keys as the dict returned by histogram_of_chars.
+    """
+
+    def __init__(self, counts=None):
+        """
+        Initialize a histogram.
+
+        Args:
+            counts: Optional mapping of bin names to counts; missing bins are 0
+        """
+        super().__init__((name, 0) for name in BINS)
+        if counts:
+            self.merge(counts)
+
+    @classmethod
+    def from_class_counts(cls, counts) -> 'CharHistogram':
+        """
+        Build a histogram from per-class counts.
+
+        Args:
+            counts: A sequence indexed by the chars class constants
+
+        Returns:
+            A new CharHistogram
+        """
+        hist = cls()
+        for c, count in enumerate(counts):
+            if c in chars.HISTOGRAM_BINS:
+                hist[chars.HISTOGRAM_BINS[c]] += int(count)
+        return hist
+
+    def merge(self, other) -> 'CharHistogram':
+        """
+        Add another histogram's counts to this one in place.
+
+        Args:
+            other: A CharHistogram or a dict with the same bins
+
+        Returns:
+            This histogram
+        """
+        for name, count in other.items():
+            if name not in self:
+                raise KeyError(name)
+            self[name] += count
+        return self
+
+    def total(self) -> int:
+        """Return the number of counted characters."""
+        return sum(self.values())
+
+    def __add__(self, other):
+        if not isinstance(other, dict):
+            return NotImplemented
+        return CharHistogram(self).merge(other)
+
+    def __radd__(self, other):
+        # sum() starts from 0, so sum(parts) works without a start value.
+        if isinstance(other, int) and other == 0:
+            return CharHistogram(self)
+        return self.__add__(other)
+
+    def __iadd__(self, other):
+        if not isinstance(other, dict):
+            return NotImplemented
+        return self.merge(other)
+
+
+class RollingCharHistogram:
+    """
+    The character-class histogram of the most recent part of a stream.
+
+    The window holds the last ``size`` characters, the characters that
+    arrived in the last ``seconds``, or both. Chunks are added with update,
+    which costs time proportional to the chunk; queries take constant time.
+    With ``size``, at most about twice that many characters are held::
+
+        window = RollingCharHistogram(size=1 << 20)
+        for event in events:
+            window.update(event.payload)
+            if window.ratio('control code') > 0.01:
+                alert()
+
+    Time windows evict whole chunks: every character of a chunk counts as
+    arriving at the time the chunk was added.
+    """
+
+    def __init__(self, size: int = None, seconds: float = None, clock=time.monotonic):
+        """
+        Initialize an empty window.
+
+        Args:
+            size: Number of most recent characters to keep
+            seconds: How long characters stay in the window
+            clock: Function returning the current time in seconds
+
+        Raises:
+            ValueError: If neither size nor seconds is given, or one is not positive
+        """
+        if size is None and seconds is None:
+            raise ValueError('a rolling histogram needs a size or a duration')
+        if (size is not None and size <= 0) or (seconds is not None and seconds <= 0):
+            raise ValueError('the window size and duration must be positive')
+        self.size = size
+        self.seconds = seconds
+        self.clock = clock
+        # [arrival time, data, index of the first character in the window,
+        #  class counts of the characters in the window]
+        self._chunks = collections.deque()
+        self._counts = [0] * 8
+        self._length = 0
+
+    def update(self, chunk, now: float = None) -> 'RollingCharHistogram':
+        """
+        Add a chunk of the stream and evict what falls out of the window.
+
+        Args:
+            chunk: A str, or a bytes-like object (one character per byte)
+            now: Arrival time of the chunk; defaults to clock()
+
+        Returns:
+            This rolling histogram
+        """
+        if now is None:
+            now = self.clock()
+        if not isinstance(chunk, str):
+            chunk = bytes(chunk)
+        if self.size is not None and len(chunk) > self.size:
+            chunk = chunk[-self.size:]
+        if chunk:
+            counts = _class_counts(chunk)
+            self._chunks.append([now, chunk, 0, counts])
+            for c, n in enumerate(counts):
+                self._counts[c] += n
+            self._length += len(chunk)
+        self._evict(now)
+        return self
+
+    def histogram(self, now: float = None) -> CharHistogram:
+        """
+        Return the bins of the characters in the window.
+
+        Args:
+            now: Current time for a time window; defaults to clock()
+
+        Returns:
+            A new CharHistogram
+        """
+        self._expire(now)
+        return CharHistogram.from_class_counts(self._counts)
+
+    def ratio(self, name: str, now: float = None) -> float:
+        """
+        Return the share of the window's characters that fall in one bin.
+
+        Args:
+            name: A bin name, e.g. "control code"
+            now: Current time for a time window; defaults to clock()
+
+        Returns:
+            The bin count divided by the number of characters in the window,
+            or 0.0 if the window is empty
+
+        Raises:
+            KeyError: If name is not a bin
+        """
+        if name not in BINS:
+            raise KeyError(name)
+        self._expire(now)
+        if not self._length:
+            return 0.0
+        count = sum(n for c, n in enumerate(self._counts) if chars.HISTOGRAM_BINS.get(c) == name)
+        return count / self._length
+
+    def clear(self):
+        """Empty the window."""
+        self._chunks.clear()
+        self._counts = [0] * 8
+        self._length = 0
+
+    def __len__(self):
+        """Return the number of characters in the window."""
+        self._expire(None)
+        return self._length
+
+    def __repr__(self):
+        return f'RollingCharHistogram(size={self.size!r}, seconds={self.seconds!r})'
+
+    def _expire(self, now: float or None):
+        """Evict the chunks that are too old, for time windows."""
+        if self.seconds is not None:
+            self._evict(self.clock() if now is None else now)
+
+    def _evict(self, now: float):
+        """Drop whole chunks that are too old, then the characters beyond size."""
+        chunks = self._chunks
+        if self.seconds is not None:
+            cutoff = now - self.seconds
+            while chunks and chunks[0][0] <= cutoff:
+                self._drop(chunks.popleft())
+
+        if self.size is not None:
+            excess = self._length - self.size
+            while excess > 0:
+                entry = chunks[0]
+                left = len(entry[1]) - entry[2]
+                if left <= excess:
+                    self._drop(chunks.popleft())
+                    excess -= left
+                    continue
+                # Count only the characters that leave, so each is counted once.
+                counts = _class_counts(entry[1][entry[2]:entry[2] + excess])
+                for c, n in enumerate(counts):
+                    entry[3][c] -= n
+                    self._counts[c] -= n
+                entry[2] += excess
+                self._length -= excess
+                excess = 0
+
+    def _drop(self, entry: list):
+        """Remove the counts of an evicted chunk."""
+        for c, n in enumerate(entry[3]):
+            self._counts[c] -= n
+        self._length -= len(entry[1]) - entry[2]
+
+
+def histogram(data, backend: str = None) -> CharHistogram:
+    """
+    Compute the character-class histogram of a string or buffer.
+
+    Args:
+        data: A str, a bytes-like object (one character per byte), or a NumPy
+            array of uint8 bytes or uint32 codepoints
+        backend: "numpy" or "python"; by default NumPy is used for arrays and
+            for large inputs when it is installed
+
+    Returns:
+        A CharHistogram with the same bins as histogram_of_chars
+
+    Raises:
+        ImportError: If the numpy backend is requested but NumPy is missing
+        ValueError: If the backend is unknown
+    """
+    if backend is None:
+        use_numpy = np is not None and (isinstance(data, np.ndarray) or len(data) >= 1 << 16)
+    elif backend == 'numpy':
+        if np is None:
+            raise ImportError('numpy is required for the numpy histogram backend')
+        use_numpy = True
+    elif backend == 'python':
+        use_numpy = False
+    else:
+        raise ValueError(f'unknown histogram backend {backend!r}')
+
+    if use_numpy:
+        return CharHistogram.from_class_counts(_numpy_counts(data))
+    return CharHistogram.from_class_counts(_class_counts(data))
+
+
+def byte_class_counts(data) -> list:
+    """
+    Count the bytes of each class in a bytes-like object.
+
+    Args:
+        data: A bytes-like object, or any iterable of codepoints
+
+    Returns:
+        A list indexed by the chars class constants
+    """
+    counts = [0] * 8
+    for i, n in collections.Counter(data).items():
+        counts[chars.CHAR_CLASS[i] if 0 <= i <= 255 else chars.NONE] += n
+    return counts
+
+
+def _class_counts(data) -> list:
+    """Count the characters of each class in a str or bytes."""
+    if isinstance(data, str):
+        return chars.class_counts(data)
+    return byte_class_counts(data)
+
+
+def _numpy_counts(data):
+    """Count classes with one bincount over a 257-entry lookup table."""
+    if isinstance(data, str):
+        codes = np.frombuffer(data.encode('utf-32-le'), dtype='<u4')
+    elif isinstance(data, np.ndarray):
+        codes = data.ravel()
+    else:
+        codes = np.frombuffer(data, dtype=np.uint8)
+    # Index 256 stands for every codepoint above 255.
+    table = np.frombuffer(chars.CHAR_CLASS + bytes([chars.NONE]), dtype=np.uint8)
+    if codes.dtype != np.uint8:
+        codes = np.minimum(codes, 256)
+    return np.bincount(table[codes], minlength=8)
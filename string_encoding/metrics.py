@@ -0,0 +1,153 @@
+"""
+Opt-in instrumentation of the String encode/decode methods.
+
+When a :class:`Recorder` is enabled, every call of ``base64``,
+``decode_base64``, ``byte_pair_encoding``, ``decode_byte_pair``,
+``cyclic_bits``, ``decode_cyclic_bits``, ``cyclic_chars`` and
+``decode_cyclic_chars`` is counted per operation, with the bytes in and out,
+a histogram of wall times and the exceptions raised. Instrumentation is off
+until :func:`enable` is called, and then costs one global lookup per call::
+
+    from string_encoding import metrics
+
+    recorder = metrics.enable(sink=my_exporter)
+    ...
+    for op, stats in recorder.snapshot(reset=True).items():
+        print(op, stats.calls, stats.bytes_in, stats.errors)
+
+Sizes count one byte per character, as in the String methods. A sink, if
+given, is called with a :data:`Call` after every call, in the calling thread;
+it should be quick, e.g. put the call on a queue. Errors raised by the sink
+are logged and never reach the caller of the String method.
+"""
+
+import bisect
+import collections
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds, in seconds, of the wall time histogram buckets. The last
+# bucket counts the calls slower than all of them.
+DEFAULT_BUCKETS = (1e-5, 1e-4, 1e-3, 1e-2, 1e-1, 1.0, 10.0)
+
+Call = collections.namedtuple('Call', 'op bytes_in bytes_out seconds error')
+Call.__doc__ = """One instrumented call; error is the exception raised, or None."""
+
+OpStats = collections.namedtuple('OpStats', 'calls bytes_in bytes_out seconds histogram errors')
+OpStats.__doc__ = """
+Totals of one operation.
+
+histogram holds one count per bucket of Recorder.buckets, plus one for the
+calls slower than the last bound; errors maps exception names to counts.
+"""
+
+# The recorder the String methods report to, or None when instrumentation is off.
+active = None
+
+
+class Recorder:
+    """
+    A thread-safe collector of per-operation call statistics.
+    """
+
+    def __init__(self, sink=None, buckets: tuple = DEFAULT_BUCKETS):
+        """
+        Initialize an empty recorder.
+
+        Args:
+            sink: Optional callable that receives a Call after every call
+            buckets: Increasing upper bounds of the wall time histogram, in seconds
+
+        Raises:
+            ValueError: If buckets is empty or not strictly increasing
+        """
+        buckets = tuple(buckets)
+        if not buckets or any(a >= b for a, b in zip(buckets, buckets[1:])):
+            raise ValueError('buckets must be a non-empty, strictly increasing sequence')
+        self.sink = sink
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._ops = {}
+
+    def record(self, op: str, bytes_in: int, bytes_out: int, seconds: float, error: Exception = None):
+        """
+        Add one call to the statistics and pass it to the sink.
+
+        Errors raised by the sink are logged to the "string_encoding.metrics"
+        logger and otherwise ignored.
+
+        Args:
+            op: The String method name
+            bytes_in: Size of the input
+            bytes_out: Size of the result (0 if there is none)
+            seconds: Wall time of the call
+            error: The exception the call raised, if any
+        """
+        bucket = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            stats = self._ops.get(op)
+            if stats is None:
+                stats = self._ops[op] = [0, 0, 0, 0.0, [0] * (len(self.buckets) + 1),
+                                         collections.Counter()]
+            stats[0] += 1
+            stats[1] += bytes_in
+            stats[2] += bytes_out
+            stats[3] += seconds
+            stats[4][bucket] += 1
+            if error is not None:
+                stats[5][type(error).__name__] += 1
+        if self.sink is not None:
+            # A failing sink must not break or mask the instrumented call.
+            try:
+                self.sink(Call(op, bytes_in, bytes_out, seconds, error))
+            except Exception:
+                logger.exception('metrics sink %r failed', self.sink)
+
+    def snapshot(self, reset: bool = False) -> dict:
+        """
+        Return a copy of the statistics.
+
+        Args:
+            reset: Also clear the statistics, atomically with the copy
+
+        Returns:
+            A dict mapping operation names to OpStats
+        """
+        with self._lock:
+            ops = {op: OpStats(s[0], s[1], s[2], s[3], tuple(s[4]), dict(s[5]))
+                   for op, s in self._ops.items()}
+            if reset:
+                self._ops = {}
+        return ops
+
+    def reset(self):
+        """Clear the statistics."""
+        with self._lock:
+            self._ops = {}
+
+    def __repr__(self):
+        return f'Recorder(sink={self.sink!r}, buckets={self.buckets!r})'
+
+
+def enable(sink=None, buckets: tuple = DEFAULT_BUCKETS) -> Recorder:
+    """
+    Turn on instrumentation of the String methods with a new recorder.
+
+    Args:
+        sink: Optional callable that receives a Call after every call
+        buckets: Increasing upper bounds of the wall time histogram, in seconds
+
+    Returns:
+        The new active Recorder
+    """
+    global active
+    active = Recorder(sink, buckets)
+    return active
+
+
+def disable():
+    """Turn instrumentation off and drop the active recorder."""
+    global active
+    active = None
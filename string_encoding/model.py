@@ -0,0 +1,104 @@
+"""
+Reusable byte pair encoding models.
+
+A :class:`BytePairModel` learns its merge rules once from a sample corpus and
+then encodes any number of strings with a precompiled merge table, instead of
+relearning the rules for every string the way
+:meth:`String.byte_pair_encoding` does.
+"""
+
+from . import bpe
+from .string import String, BytePairError, BytePairDecodeError
+
+
+class BytePairModel:
+    """
+    A trained set of byte pair merges that can be applied to many strings.
+
+    Encoded strings carry the model's ``rules`` list (the same list object,
+    not a copy), so they can also be decoded with
+    :meth:`String.decode_byte_pair`.
+    """
+
+    def __init__(self, rules: list):
+        """
+        Initialize a model from a list of rules.
+
+        Args:
+            rules: Rules in the "X = ab" format produced by byte_pair_encoding
+
+        Raises:
+            BytePairError: If a rule is not in the "X = ab" format
+        """
+        self.rules = list(rules)
+        try:
+            self.merges = [bpe.parse_rule(rule)[::-1] for rule in self.rules]
+        except ValueError:
+            raise BytePairError(self.rules, "are not valid byte pair rules.")
+        self.table = bpe.compile_merges(self.merges)
+        self.symbols = frozenset(symbol for _, symbol in self.merges)
+
+    @classmethod
+    def train(cls, corpus) -> 'BytePairModel':
+        """
+        Learn a model from a sample corpus.
+
+        The rules are the ones String.byte_pair_encoding would learn from the
+        concatenated corpus.
+
+        Args:
+            corpus: A string, or an iterable of strings
+
+        Returns:
+            A new BytePairModel
+
+        Raises:
+            BytePairError: If the corpus cannot be used for byte pair encoding
+        """
+        if not isinstance(corpus, str):
+            corpus = ''.join(corpus)
+        return cls(String(corpus).byte_pair_encoding().rules)
+
+    def encode(self, text: str) -> String:
+        """
+        Encode a string with the model's merges.
+
+        Args:
+            text: The string to encode
+
+        Returns:
+            A new String instance with the encoded value and the model's rules
+
+        Raises:
+            BytePairError: If the string holds characters above 255 or any of
+                the model's replacement symbols
+        """
+        if text and (max(text) > '\xff' or not self.symbols.isdisjoint(text)):
+            raise BytePairError(text, "can't be used for byte pair encoding.")
+        return String(bpe.apply_merges(str(text), self.merges, self.table), self.rules)
+
+    def decode(self, text: str) -> String:
+        """
+        Decode a string encoded with this model.
+
+        Args:
+            text: The encoded string
+
+        Returns:
+            A new String instance with the decoded value
+
+        Raises:
+            BytePairDecodeError: If the string cannot be decoded
+        """
+        if not self.rules:
+            if text and max(text) > '\xff':
+                raise BytePairDecodeError(text, "can't be used for byte pair decoding")
+            return String(text)
+        return String(text, self.rules).decode_byte_pair()
+
+    def __len__(self):
+        """Return the number of merges in the model."""
+        return len(self.merges)
+
+    def __repr__(self):
+        return f'BytePairModel({self.rules!r})'
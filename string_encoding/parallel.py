@@ -0,0 +1,224 @@
+"""
+Parallel Base64 coding and pair counting over a single large payload.
+
+Base64 splits cleanly on 3-byte input / 4-character output boundaries, so a
+large payload is cut into aligned slices that worker processes encode
+independently. Input and output live in ``multiprocessing.shared_memory``
+blocks: workers receive only the block names and slice offsets, and write
+their output in place. Only the last slice has a partial group to handle
+(this package emits no ``=`` padding, see :meth:`String.base64`).
+
+:func:`index_shards` shards the pair index of byte pair encoding the same
+way: workers collect the pair positions of their shard, and
+:class:`string_encoding.bpe.PairIndex` joins them. :func:`count_pairs` counts
+from that index; pass the shards to :func:`string_encoding.bpe.learn` to
+train from it. :meth:`String.byte_pair_encoding` itself never starts
+processes.
+
+``multiprocessing.shared_memory`` needs Python 3.8+. On older versions, and
+for payloads below ``PARALLEL_THRESHOLD``, the work runs in this process.
+"""
+
+import array
+import concurrent.futures
+import os
+
+from . import b64, bpe, chars
+from .string import String, Base64DecodeError, BytePairError, str_2_bytes
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:  # Python < 3.8
+    shared_memory = None
+
+# Payloads smaller than this (in bytes or characters) run in this process.
+PARALLEL_THRESHOLD = 1 << 22
+
+
+def encode_base64(data, workers: int = None, threshold: int = PARALLEL_THRESHOLD) -> String:
+    """
+    Encode a large payload to Base64 across worker processes.
+
+    Args:
+        data: A str (one byte per character, as String.base64) or a
+            bytes-like object
+        workers: Number of worker processes (default: the CPU count)
+        threshold: Payloads smaller than this are encoded in this process
+
+    Returns:
+        A new String instance with the same value as String.base64. Empty
+        input, str or bytes, gives an empty String without the diagnostic
+        String.base64 prints.
+    """
+    if isinstance(data, str):
+        data = str_2_bytes(data)
+    data = memoryview(data).cast('B')
+    workers = workers or os.cpu_count() or 1
+    if shared_memory is None or workers == 1 or len(data) < max(threshold, 1):
+        return String(b64.encode(data))
+
+    groups = len(data) // 3
+    out_size = groups * 4 + (0, 2, 3)[len(data) % 3]
+    step = max(-(-groups // workers), 1) * 3
+    slices = [(start, min(start + step, len(data))) for start in range(0, len(data), step)]
+    return String(_run(_encode_slice, data, out_size, [
+        (start, end, start // 3 * 4) for start, end in slices
+    ], workers).decode('ascii'))
+
+
+def decode_base64(text: str, workers: int = None, threshold: int = PARALLEL_THRESHOLD) -> String:
+    """
+    Decode a large Base64 payload across worker processes.
+
+    Args:
+        text: The Base64 text
+        workers: Number of worker processes (default: the CPU count)
+        threshold: Payloads smaller than this are decoded in this process
+
+    Returns:
+        A new String instance with the same value as String.decode_base64
+
+    Raises:
+        Base64DecodeError: If the text cannot be decoded with base64
+    """
+    workers = workers or os.cpu_count() or 1
+    if shared_memory is None or workers == 1 or len(text) < threshold:
+        return String(text).decode_base64()
+
+    scrunched = text.translate(b64.STRIP_TABLE)
+    if not scrunched or len(scrunched) % 4 == 1:
+        raise Base64DecodeError(text, 'cannot be decode with base 64')
+    try:
+        data = scrunched.encode('ascii')
+    except UnicodeEncodeError:
+        raise Base64DecodeError(text, 'cannot be decode with base 64')
+
+    groups = len(data) // 4
+    out_size = groups * 3 + (0, 0, 1, 2)[len(data) % 4]
+    step = max(-(-groups // workers), 1) * 4
+    slices = [(start, min(start + step, len(data))) for start in range(0, len(data), step)]
+    raw = _run(_decode_slice, data, out_size, [
+        (start, end, start // 4 * 3) for start, end in slices
+    ], workers)
+    if raw is None:
+        raise Base64DecodeError(text, 'cannot be decode with base 64')
+    try:
+        return String(raw.decode('ascii'))
+    except UnicodeDecodeError:
+        raise Base64DecodeError(text, 'cannot be decode with base 64')
+
+
+def index_shards(text: str, workers: int = None, threshold: int = PARALLEL_THRESHOLD) -> list:
+    """
+    Collect the pair positions of a string across worker processes.
+
+    Args:
+        text: A string of Latin-1 characters
+        workers: Number of worker processes (default: the CPU count)
+        threshold: Strings shorter than this are indexed in this process
+
+    Returns:
+        The string_encoding.bpe.index_shard results of consecutive shards,
+        in order, for string_encoding.bpe.PairIndex; positions from workers
+        come as arrays
+    """
+    workers = workers or os.cpu_count() or 1
+    if shared_memory is None or workers == 1 or len(text) < max(threshold, 2):
+        return [bpe.index_shard(text)]
+
+    # Shards split the pair positions; each also reads the character after it.
+    pairs = len(text) - 1
+    step = -(-pairs // workers)
+    jobs = [(start, min(start + step, pairs) + 1) for start in range(0, pairs, step)]
+    return _map(_index_slice, text.encode('latin-1'), jobs, workers)
+
+
+def count_pairs(text: str, workers: int = None, threshold: int = PARALLEL_THRESHOLD) -> dict:
+    """
+    Count adjacent character pairs across worker processes.
+
+    Args:
+        text: The string to analyze
+        workers: Number of worker processes (default: the CPU count)
+        threshold: Strings shorter than this are counted in this process
+
+    Returns:
+        The same dict as string_encoding.string.count_pairs, in the same order
+
+    Raises:
+        BytePairError: If the string contains invalid characters
+    """
+    if chars.first_above_latin1(text) is not None:
+        raise BytePairError(text, "can't be used for byte pair encoding.")
+    return bpe.pair_counts(text, index_shards(text, workers, threshold))
+
+
+def _run(worker, data, out_size, jobs, workers) -> bytes or None:
+    """Copy data to shared memory, run the slice jobs and collect the output."""
+    dst = shared_memory.SharedMemory(create=True, size=max(out_size, 1))
+    try:
+        ok = all(_map(worker, data, [(dst.name,) + job for job in jobs], workers))
+        return bytes(dst.buf[:out_size]) if ok else None
+    finally:
+        dst.close()
+        dst.unlink()
+
+
+def _map(worker, data, jobs, workers) -> list:
+    """Copy data to shared memory and run worker(src_name, *job) for each job."""
+    src = shared_memory.SharedMemory(create=True, size=max(len(data), 1))
+    try:
+        src.buf[:len(data)] = data
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(worker, src.name, *job) for job in jobs]
+            return [future.result() for future in futures]
+    finally:
+        src.close()
+        src.unlink()
+
+
+def _attach(name: str):
+    """
+    Attach to a shared memory block owned by the parent process.
+
+    Pool workers share the parent's resource tracker, so the block stays
+    registered once and is released by the parent's unlink.
+    """
+    return shared_memory.SharedMemory(name=name)
+
+
+def _encode_slice(src_name, dst_name, start, end, out) -> bool:
+    """Encode src[start:end] into dst at offset out."""
+    src, dst = _attach(src_name), _attach(dst_name)
+    try:
+        encoded = b64.encode(bytes(src.buf[start:end])).encode('ascii')
+        dst.buf[out:out + len(encoded)] = encoded
+        return True
+    finally:
+        src.close()
+        dst.close()
+
+
+def _decode_slice(src_name, dst_name, start, end, out) -> bool:
+    """Decode src[start:end] into dst at offset out; False if it is invalid."""
+    src, dst = _attach(src_name), _attach(dst_name)
+    try:
+        decoded = b64.decode(bytes(src.buf[start:end]).decode('ascii'))
+        if decoded is None:
+            return False
+        dst.buf[out:out + len(decoded)] = decoded
+        return True
+    finally:
+        src.close()
+        dst.close()
+
+
+def _index_slice(src_name, start, stop) -> dict:
+    """Collect the pair positions of the shared text[start:stop] with bpe.index_shard."""
+    src = _attach(src_name)
+    try:
+        shard = bpe.index_shard(bytes(src.buf[start:stop]).decode('latin-1'), start)
+        # Arrays pickle as raw bytes, much smaller and faster than int lists.
+        return {pair: array.array('q', positions) for pair, positions in shard.items()}
+    finally:
+        src.close()
@@ -0,0 +1,261 @@
+"""
+Fused chains of String transformations.
+
+A :class:`Pipeline` records a chain such as ``s.cyclic_chars(7).base64()``
+and runs it over the input chunk by chunk, so no step materializes a
+full-size intermediate String. Consecutive character shifts are compiled into
+a single ``str.translate`` table, and Base64 steps use the streaming coders
+of :mod:`string_encoding.stream`.
+
+Steps that need the whole input at once (cyclic_bits, byte pair encoding, and
+character shifts with a non-integer number) fall back to the String method:
+the chunks are joined, the method runs, and its result is split into chunks
+again for the following steps.
+"""
+
+from . import chars, stream
+from .string import (String, CyclicCharsError, CyclicCharsDecodeError, EMPTY_RULES,
+                     valid_num_check)
+
+DEFAULT_CHUNK_SIZE = stream.DEFAULT_CHUNK_SIZE
+
+# Each step and the step that undoes it.
+INVERSE = {
+    'base64': 'decode_base64',
+    'decode_base64': 'base64',
+    'byte_pair_encoding': 'decode_byte_pair',
+    'decode_byte_pair': 'byte_pair_encoding',
+    'cyclic_bits': 'decode_cyclic_bits',
+    'decode_cyclic_bits': 'cyclic_bits',
+    'cyclic_chars': 'decode_cyclic_chars',
+    'decode_cyclic_chars': 'cyclic_chars',
+}
+
+# Character shift steps: direction, error type and message.
+_SHIFTS = {
+    'cyclic_chars': (1, CyclicCharsError, "can't use cyclic chars with number {}"),
+    'decode_cyclic_chars': (-1, CyclicCharsDecodeError, "can't use decode cyclic chars with number {}"),
+}
+
+
+class Pipeline:
+    """
+    An immutable chain of String transformations.
+
+    Each step method returns a new Pipeline with the step appended, so
+    pipelines can be built once and shared::
+
+        transport = Pipeline().cyclic_chars(7).base64()
+        encoded = transport.run(text)
+        decoded = transport.inverse().run(encoded)
+
+    A pipeline holds at most one byte pair step. The rules learned by
+    byte_pair_encoding travel on the String returned by run, and a
+    decode_byte_pair step uses the rules of the String it is run on.
+    """
+
+    def __init__(self, steps: tuple = ()):
+        """
+        Initialize a pipeline.
+
+        Args:
+            steps: (method name, args) tuples, in the order they run
+
+        Raises:
+            ValueError: If a step is unknown or there is more than one byte
+                pair step
+        """
+        self.steps = tuple((name, tuple(args)) for name, args in steps)
+        for name, _ in self.steps:
+            if name not in INVERSE:
+                raise ValueError(f'unknown pipeline step {name!r}')
+        if sum(name in ('byte_pair_encoding', 'decode_byte_pair') for name, _ in self.steps) > 1:
+            raise ValueError('a pipeline can hold at most one byte pair step')
+        self._plan = None
+
+    def base64(self) -> 'Pipeline':
+        """Append a String.base64 step."""
+        return self._then('base64')
+
+    def decode_base64(self) -> 'Pipeline':
+        """Append a String.decode_base64 step."""
+        return self._then('decode_base64')
+
+    def byte_pair_encoding(self) -> 'Pipeline':
+        """Append a String.byte_pair_encoding step."""
+        return self._then('byte_pair_encoding')
+
+    def decode_byte_pair(self) -> 'Pipeline':
+        """Append a String.decode_byte_pair step."""
+        return self._then('decode_byte_pair')
+
+    def cyclic_bits(self, num: int) -> 'Pipeline':
+        """Append a String.cyclic_bits step."""
+        return self._then('cyclic_bits', num)
+
+    def decode_cyclic_bits(self, num: int) -> 'Pipeline':
+        """Append a String.decode_cyclic_bits step."""
+        return self._then('decode_cyclic_bits', num)
+
+    def cyclic_chars(self, num: int) -> 'Pipeline':
+        """Append a String.cyclic_chars step."""
+        return self._then('cyclic_chars', num)
+
+    def decode_cyclic_chars(self, num: int) -> 'Pipeline':
+        """Append a String.decode_cyclic_chars step."""
+        return self._then('decode_cyclic_chars', num)
+
+    def inverse(self) -> 'Pipeline':
+        """
+        Return the pipeline that undoes this one.
+
+        Returns:
+            A new Pipeline with the inverse steps in reverse order
+        """
+        return Pipeline((INVERSE[name], args) for name, args in reversed(self.steps))
+
+    def run(self, text: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> String:
+        """
+        Run the pipeline over a string.
+
+        The result is the same as calling the step methods one after the
+        other, except that a cyclic_bits or decode_cyclic_bits step passes an
+        empty string on instead of returning None. A character shift step
+        that returns None raises its error instead.
+
+        Args:
+            text: The input string; its rules are used by a decode_byte_pair step
+            chunk_size: Number of characters each step handles at a time
+
+        Returns:
+            A new String instance, carrying the rules of a byte_pair_encoding
+            step if the pipeline has one
+
+        Raises:
+            The error of the failing step, e.g. Base64DecodeError. Errors of
+            fused steps carry the failing chunk instead of the whole input,
+            and if the input is invalid for more than one step, the error can
+            come from a later step than with chained calls.
+        """
+        state = {'rules': getattr(text, 'rules', EMPTY_RULES)}
+        out = ''.join(self._apply(_slices(text, chunk_size), state, chunk_size))
+        if any(name == 'byte_pair_encoding' for name, _ in self.steps):
+            return String(out, state['rules'])
+        return String(out)
+
+    def iter_run(self, src, chunk_size: int = DEFAULT_CHUNK_SIZE, rules: list = None):
+        """
+        Run the pipeline over a stream, piece by piece.
+
+        Args:
+            src: A file object or an iterable of str chunks
+            chunk_size: Number of characters read per call
+            rules: Rules for a decode_byte_pair step
+
+        Yields:
+            Pieces of the output, in order. Pieces yielded before an error
+            are not retracted.
+
+        Raises:
+            ValueError: If the pipeline has a byte_pair_encoding step, whose
+                rules only run() can return
+        """
+        if any(name == 'byte_pair_encoding' for name, _ in self.steps):
+            raise ValueError('use run() for pipelines with a byte_pair_encoding step')
+        state = {'rules': rules if rules is not None else EMPTY_RULES}
+        return self._apply(stream.iter_chunks(src, chunk_size), state, chunk_size)
+
+    def _then(self, name: str, *args) -> 'Pipeline':
+        """Return a new Pipeline with one more step."""
+        return Pipeline(self.steps + ((name, args),))
+
+    def _compile(self) -> list:
+        """
+        Compile the steps into a plan, once per pipeline.
+
+        Consecutive integer character shifts become one shift. Only the first
+        of them can meet an unprintable character, since every shift outputs
+        printable ASCII, so the merged shift reports errors like the first.
+        """
+        if self._plan is not None:
+            return self._plan
+        plan = []
+        for name, args in self.steps:
+            if name in _SHIFTS and _fusable(args[0]):
+                sign, error, message = _SHIFTS[name]
+                if plan and plan[-1][0] == 'shift':
+                    plan[-1] = ('shift', plan[-1][1] + sign * args[0], plan[-1][2], plan[-1][3])
+                else:
+                    plan.append(('shift', sign * args[0], error, message.format(args[0])))
+            elif name in ('base64', 'decode_base64'):
+                plan.append((name,))
+            else:
+                plan.append(('method', name, args))
+        self._plan = plan
+        return plan
+
+    def _apply(self, chunks, state: dict, chunk_size: int):
+        """Chain the step generators of the compiled plan over the chunks."""
+        for step in self._compile():
+            if step[0] == 'shift':
+                chunks = _shift(chunks, *step[1:])
+            elif step[0] == 'base64':
+                chunks = stream.iter_base64_encode(chunks)
+            elif step[0] == 'decode_base64':
+                chunks = stream.iter_base64_decode(chunks)
+            else:
+                chunks = _fallback(chunks, step[1], step[2], state, chunk_size)
+        return chunks
+
+    def __len__(self):
+        return len(self.steps)
+
+    def __eq__(self, other):
+        if not isinstance(other, Pipeline):
+            return NotImplemented
+        return self.steps == other.steps
+
+    def __hash__(self):
+        return hash(self.steps)
+
+    def __repr__(self):
+        calls = ''.join(f".{name}({', '.join(map(repr, args))})" for name, args in self.steps)
+        return f'Pipeline(){calls}'
+
+
+def _fusable(num) -> bool:
+    """Return True if a shift number behaves like a plain int in the String methods."""
+    # valid_num_check goes through float, so only exactly representable ints.
+    return type(num) is int and valid_num_check(num) == num
+
+
+def _slices(text: str, size: int):
+    """Yield the chunks of a string as plain str slices."""
+    for index in range(0, len(text), size):
+        yield str.__getitem__(text, slice(index, index + size))
+
+
+def _shift(chunks, shift: int, error: type, message: str):
+    """Shift every chunk cyclically, like cyclic_chars with the summed number."""
+    table = chars.cyclic_table(shift % chars.PRINTABLE_COUNT)
+    for chunk in chunks:
+        if chars.first_unprintable(chunk) is not None:
+            raise error(chunk, message)
+        yield chunk.translate(table)
+
+
+def _fallback(chunks, name: str, args: tuple, state: dict, chunk_size: int):
+    """Join the chunks, run the String method on them and split the result."""
+    rules = state['rules'] if name == 'decode_byte_pair' else None
+    text = String(''.join(chunks), rules)
+    result = getattr(text, name)(*args)
+    if result is None:
+        if name in ('cyclic_bits', 'decode_cyclic_bits'):  # empty input
+            return
+        # Any other None is a failed step; passing it on as '' would turn the
+        # failure into an empty result.
+        _, error, message = _SHIFTS[name]
+        raise error(text, message.format(args[0]))
+    if name == 'byte_pair_encoding':
+        state['rules'] = result.rules
+    yield from _slices(result, chunk_size)
@@ -0,0 +1,148 @@
+"""
+Streaming Base64 encoding and decoding.
+
+The functions in this module read from binary or text file objects (anything
+with a ``read`` method) or from iterables of ``bytes``/``str`` chunks, and
+keep only one chunk plus a few carried-over bytes in memory at a time. The
+output matches :meth:`String.base64` and :meth:`String.decode_base64` on the
+same content.
+"""
+
+import io
+
+from . import b64
+from .string import Base64DecodeError, str_2_bytes
+
+# A multiple of 3 (encoding) and 4 (decoding) so that chunks split cleanly.
+DEFAULT_CHUNK_SIZE = 3 * 4 * 2 ** 14
+
+
+def iter_chunks(src, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """
+    Yield the chunks of a file object or an iterable.
+
+    Args:
+        src: A file object with a ``read`` method, or an iterable of chunks
+        chunk_size: Number of bytes or characters to read per call
+
+    Yields:
+        The chunks, as ``bytes``-like objects or ``str``
+    """
+    if hasattr(src, 'read'):
+        while True:
+            chunk = src.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+    else:
+        for chunk in src:
+            if chunk:
+                yield chunk
+
+
+def iter_base64_encode(src, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """
+    Encode a stream to Base64 piece by piece.
+
+    Args:
+        src: A file object or an iterable of ``bytes``/``str`` chunks
+        chunk_size: Number of bytes or characters to read per call
+
+    Yields:
+        Pieces of the Base64 text, in order
+    """
+    carry = b''
+    for chunk in iter_chunks(src, chunk_size):
+        if isinstance(chunk, str):
+            chunk = str_2_bytes(chunk)
+        data = carry + bytes(chunk)
+        full = len(data) - len(data) % 3
+        carry = data[full:]
+        if full:
+            yield b64.encode(data[:full])
+    if carry:
+        yield b64.encode(carry)
+
+
+def iter_base64_decode(src, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """
+    Decode a Base64 stream piece by piece.
+
+    Args:
+        src: A file object or an iterable of ``bytes``/``str`` chunks
+        chunk_size: Number of bytes or characters to read per call
+
+    Yields:
+        Pieces of the decoded text, in order
+
+    Raises:
+        Base64DecodeError: If the stream cannot be decoded with base64. Pieces
+            yielded before the error was found are not retracted.
+    """
+    carry = ''
+    seen = False
+    for chunk in iter_chunks(src, chunk_size):
+        if not isinstance(chunk, str):
+            chunk = bytes(chunk).decode('latin-1')
+        data = carry + chunk.translate(b64.STRIP_TABLE)
+        full = len(data) - len(data) % 4
+        carry = data[full:]
+        if full:
+            seen = True
+            yield _decode_block(data[:full])
+    if carry or not seen:
+        yield _decode_block(carry)
+
+
+def _decode_block(block: str) -> str:
+    """Decode one stripped block, applying the same checks as decode_base64."""
+    raw = b64.decode(block)
+    if raw is None:
+        raise Base64DecodeError(block, 'cannot be decode with base 64')
+    try:
+        return raw.decode('ascii')
+    except UnicodeDecodeError:
+        raise Base64DecodeError(block, 'cannot be decode with base 64')
+
+
+def base64_encode(src, dst, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """
+    Encode a stream to Base64 and write it to a file object.
+
+    Args:
+        src: A file object or an iterable of ``bytes``/``str`` chunks
+        dst: A text or binary file object to write the Base64 text to
+        chunk_size: Number of bytes or characters to read per call
+
+    Returns:
+        The number of characters written
+    """
+    return _write_all(dst, iter_base64_encode(src, chunk_size))
+
+
+def base64_decode(src, dst, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """
+    Decode a Base64 stream and write the result to a file object.
+
+    Args:
+        src: A file object or an iterable of ``bytes``/``str`` chunks
+        dst: A text or binary file object to write the decoded text to
+        chunk_size: Number of bytes or characters to read per call
+
+    Returns:
+        The number of characters written
+
+    Raises:
+        Base64DecodeError: If the stream cannot be decoded with base64
+    """
+    return _write_all(dst, iter_base64_decode(src, chunk_size))
+
+
+def _write_all(dst, pieces) -> int:
+    """Write str pieces to a text or binary file object."""
+    text = isinstance(dst, io.TextIOBase)
+    written = 0
+    for piece in pieces:
+        dst.write(piece if text else piece.encode('ascii'))
+        written += len(piece)
+    return written
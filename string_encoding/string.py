@@ -6,7 +6,96 @@ encoding and transformation capabilities including Base64, Byte Pair Encoding, a
 transformations.
 """
 
+import functools
 import random
+import time
+
+from . import b64, bits, bpe, bpefile, cache, chars, histogram, metrics
+
+
+class _EmptyRules(list):
+    """The immutable empty rules list shared by Strings without rules."""
+
+    def _immutable(self, *args, **kwargs):
+        raise TypeError('the shared empty rules list cannot be modified')
+
+    append = extend = insert = pop = remove = clear = sort = reverse = _immutable
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _immutable
+
+    def __reduce__(self):
+        """Pickle and copy as the module-level EMPTY_RULES singleton."""
+        return 'EMPTY_RULES'
+
+
+EMPTY_RULES = _EmptyRules()
+
+
+def _cached(method):
+    """
+    Serve a String method from the active result cache, if caching is on.
+    
+    Results are keyed by method name, arguments and their types, and a hash
+    of the content; decode_byte_pair also keys on the rules. Errors and None
+    results are not cached, and each hit returns a new String with its own
+    rules list whenever the method's result had one, even an empty one. Calls that can print a diagnostic (empty input, or a number
+    that is not an int) always run the method, so cached and uncached calls
+    behave the same.
+    """
+    name = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self, *args):
+        store = cache.active
+        if store is None or not self or any(type(arg) is not int for arg in args):
+            return method(self, *args)
+        try:
+            params = args + tuple(map(type, args))
+            if name == 'decode_byte_pair':
+                params += (tuple(self.rules),)
+            key = cache.content_key(name, params, self)
+            hash(key)
+        except TypeError:  # unhashable arguments or rules
+            return method(self, *args)
+
+        entry = store.get(key)
+        if entry is not None:
+            text, rules = entry
+            return String(text, list(rules)) if rules is not None else String(text)
+        result = method(self, *args)
+        if result is not None:
+            # None marks a result without its own rules, so a hit gets the
+            # shared EMPTY_RULES exactly when the method's result did.
+            rules = result.__dict__.get('rules')
+            store.put(key, str(result), tuple(rules) if rules is not None else None)
+        return result
+    return wrapper
+
+
+def _instrumented(method):
+    """
+    Report calls of a String method to the active metrics recorder, if any.
+    
+    The call's input and output sizes, wall time and any exception raised are
+    recorded under the method name. Cache hits are recorded like other calls.
+    """
+    name = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self, *args):
+        recorder = metrics.active
+        if recorder is None:
+            return method(self, *args)
+        start = time.perf_counter()
+        try:
+            result = method(self, *args)
+        except Exception as e:
+            recorder.record(name, len(self), 0, time.perf_counter() - start, e)
+            raise
+        size = len(result) if result is not None else 0
+        recorder.record(name, len(self), size, time.perf_counter() - start)
+        return result
+    return wrapper
+
 
 class String(str):
     """
@@ -16,6 +105,12 @@ class String(str):
     cyclic bit and character transformations, and character frequency analysis.
     """
     
+    # Strings without rules share one immutable empty list, so creating a
+    # String does not allocate a rules list. Instances still have a __dict__:
+    # it holds rules when they are given and the decode table cached by
+    # _byte_pair_table.
+    rules = EMPTY_RULES
+
     def __new__(cls, str1: str, rules=None):
         return str.__new__(cls, str1)
 
@@ -27,37 +122,44 @@ class String(str):
             str1: The string value
             rules: Optional rules for byte pair encoding (used for decoding)
         """
-        if rules is None:
-            self.rules = []
-        else:
+        if rules is not None:
             self.rules = rules
 
     def __add__(self, other):
         """Concatenate with another string and maintain String type."""
-        return String(str.__add__(self, other))
+        return _wrap(str.__add__(self, other))
 
     def __radd__(self, other):
         """Right concatenation that maintains String type."""
-        return String(str.__add__(other, self))
+        return _wrap(str.__add__(other, self))
 
     def __mul__(self, other):
         """Multiply string and maintain String type."""
-        return String(str.__mul__(self, other))
+        return _wrap(str.__mul__(self, other))
 
     def __rmul__(self, other):
         """Right multiply and maintain String type."""
-        return String(str.__rmul__(self, other))
+        return _wrap(str.__rmul__(self, other))
 
     def __getitem__(self, index):
         """Get item access that maintains String type."""
-        return String(str.__getitem__(self, index))
+        return _wrap(str.__getitem__(self, index))
 
     def __iter__(self):
-        """Iterator that yields String objects instead of str."""
-        k = [String(x) for x in str.__iter__(self)]
-        for y in k:
-            yield y
+        """Iterate lazily over the characters as String objects."""
+        return map(_wrap, str.__iter__(self))
 
+    def iter_chars(self):
+        """
+        Iterate lazily over the characters as plain str objects.
+        
+        Returns:
+            An iterator of one-character str objects
+        """
+        return str.__iter__(self)
+
+    @_instrumented
+    @_cached
     def base64(self) -> 'String':
         """
         Encode the String to a base64 string.
@@ -65,20 +167,14 @@ class String(str):
         Returns:
             A new String instance with the encoded value.
         """
-        try:
-            ascii = str_2_asci_trans(self)
-            if len(ascii) == 0:
-                raise AttributeError
-            bin_8 = ascii_2_bin_trans(ascii, 8)
-        except AttributeError:
+        if len(self) == 0:
             print(f'<{self}> is not possible for base 64 encoding')
             return String(self)
-            
-        bit6 = turn_to_6_or_8_bits(bin_8, 6)
-        new_asci = ascii_2_bin_trans(bit6)
-        str_b64 = ascii_2_base64_trans(new_asci)
-        return String(str_b64)
 
+        return String(b64.encode(str_2_bytes(self)))
+
+    @_instrumented
+    @_cached
     def decode_base64(self) -> 'String':
         """
         Decode the String from base64 to its original form.
@@ -89,31 +185,19 @@ class String(str):
         Raises:
             Base64DecodeError: If the string cannot be decoded with base64
         """
-        scrunched = ''.join(i for i in self if ord(i) not in priority()[5] and i not in '=')
-        str_b64 = ascii_2_base64_trans(scrunched)
-        
-        if str_b64 is None or len(scrunched) % 4 == 1:
+        raw = b64.decode(self)
+        if raw is None:
             raise Base64DecodeError(self, 'cannot be decode with base 64')
-            
-        b64_bin = ascii_2_bin_trans(str_b64, 6)
-        full = ''.join(e for e in b64_bin)
-        split_strings = []
-        
-        for index in range(0, len(full), 8):
-            split_strings.append(full[index: index + 8])
-            
-        if len(split_strings[-1]) < 8:
-            del split_strings[-1]
-            
-        asci = ascii_2_bin_trans(split_strings)
-        f_str = str_2_asci_trans(asci)
-        
-        for k in f_str:
-            if not (0 <= ord(k) <= 127):
-                raise Base64DecodeError(self, 'cannot be decode with base 64')
-                
+
+        try:
+            f_str = raw.decode('ascii')
+        except UnicodeDecodeError:
+            raise Base64DecodeError(self, 'cannot be decode with base 64')
+
         return String(f_str)
 
+    @_instrumented
+    @_cached
     def byte_pair_encoding(self) -> 'String':
         """
         Encode the String using byte pair encoding compression.
@@ -124,36 +208,20 @@ class String(str):
         Raises:
             BytePairError: If the string cannot be compressed with byte pair encoding
         """
-        str1 = self * 1
-        prio = priority()
+        str1 = str(self)
         valid_groups = valid_gp(group_name(str1))
-        counter = count_pairs(str1)
-        
-        if valid_groups == [] or len(counter) == 0:
+
+        if chars.first_above_latin1(str1) is not None:
+            raise BytePairError(str1, "can't be used for byte pair encoding.")
+        if valid_groups == [] or len(str1) < 2:
             raise BytePairError(self, "can't be used for byte pair encoding.")
-            
-        rules = []
-        s = max(counter.items(), key=lambda x: x[1])
-        
-        while s[1] > 1:
-            try:
-                rules.extend([f'{chr(prio[valid_groups[0] - 1][0])} = {s[0]}'])
-                str1 = str1.replace(s[0], chr(prio[valid_groups[0] - 1][0]))
-                prio[valid_groups[0] - 1].pop(0)
-                
-                if not prio[valid_groups[0] - 1]:
-                    prio.pop(prio.index(prio[valid_groups[0] - 1]))
-                    valid_groups.pop(0)
-                    if len(valid_groups) == 0:
-                        raise BytePairError
-                        
-                counter = count_pairs(str1)
-                s = max(counter.items(), key=lambda x: x[1])
-            except BytePairError:
-                raise BytePairError(self, "can't be used for byte pair encoding.")
-                
-        return String(str1, rules)
 
+        symbols = bpe_symbols(self, priority(), valid_groups)
+        encoded, rules = bpe.learn(str1, symbols)
+        return String(encoded, rules)
+
+    @_instrumented
+    @_cached
     def decode_byte_pair(self) -> 'String':
         """
         Decode a byte pair encoded String back to its original form.
@@ -164,12 +232,10 @@ class String(str):
         Raises:
             BytePairDecodeError: If the string cannot be decoded
         """
-        a = bool(self.rules)  # checks for an empty rules list.
-        b = [i for i in self if not (0 <= ord(i) <= 255)]
-        
-        if len(b) != 0 or not a:
-            raise BytePairDecodeError(self, "can't be used for byte pair decoding")
-            
+        table = self._byte_pair_table()
+        if table is not None:
+            return String(self.translate(table))
+
         try:
             copy_rules = self.rules[::-1]
             for index, item in enumerate(copy_rules):
@@ -180,6 +246,94 @@ class String(str):
 
         return String(self)
 
+    def iter_decode_byte_pair(self, chunk_size: int = 1 << 16):
+        """
+        Decode a byte pair encoded String piece by piece.
+        
+        Args:
+            chunk_size: Number of encoded characters to expand per piece
+            
+        Yields:
+            Pieces of the decoded string, in order
+            
+        Raises:
+            BytePairDecodeError: If the string cannot be decoded
+        """
+        table = self._byte_pair_table()
+        if table is None:
+            yield str(self.decode_byte_pair())
+            return
+        for index in range(0, len(self), chunk_size):
+            yield str.__getitem__(self, slice(index, index + chunk_size)).translate(table)
+
+    def save_bpe(self, path: str):
+        """
+        Write a byte pair encoded String and its rules to a compact binary file.
+        
+        Args:
+            path: The file to write
+            
+        Raises:
+            BytePairError: If the String or its rules cannot be stored
+        """
+        try:
+            bpefile.dump(self, self.rules, path)
+        except ValueError:
+            raise BytePairError(self, "can't be saved as a byte pair payload")
+
+    @classmethod
+    def load_bpe(cls, path: str) -> 'String':
+        """
+        Load a byte pair encoded String written by save_bpe.
+        
+        The file is memory-mapped; use bpefile.BytePairFile directly to decode
+        it in chunks without loading the encoded text.
+        
+        Args:
+            path: The file to read
+            
+        Returns:
+            A new String instance with the encoded value and its rules
+            
+        Raises:
+            BytePairDecodeError: If the file is not a valid byte pair payload
+        """
+        try:
+            with bpefile.BytePairFile(path) as fh:
+                return cls(fh.text(), fh.rules)
+        except ValueError:
+            raise BytePairDecodeError(path, "can't be loaded as a byte pair payload")
+
+    def _byte_pair_table(self) -> dict or None:
+        """
+        Return the compiled expansion table for this String's rules.
+        
+        The table is cached on the String and reused while the rules are
+        unchanged.
+        
+        Returns:
+            A str.translate table, or None if the rules are not all in the
+            "X = ab" format
+            
+        Raises:
+            BytePairDecodeError: If the string cannot be decoded
+        """
+        a = bool(self.rules)  # checks for an empty rules list.
+        if not a or chars.first_above_latin1(self) is not None:
+            raise BytePairDecodeError(self, "can't be used for byte pair decoding")
+
+        try:
+            key = tuple(self.rules)
+            cached = self.__dict__.get('_expansions')
+            if cached is None or cached[0] != key:
+                cached = (key, bpe.expansion_table(key))
+                self._expansions = cached
+        except TypeError:
+            raise BytePairDecodeError(self, "can't be used for byte pair decoding")
+        return cached[1]
+
+    @_instrumented
+    @_cached
     def cyclic_bits(self, num: int) -> 'String':
         """
         Encode the String using cyclic bit shifting.
@@ -190,27 +344,13 @@ class String(str):
         Returns:
             A new String instance with bits shifted cyclically
         """
-        ascii = str_2_asci_trans(self)
-        bin_8 = ascii_2_bin_trans(ascii, 8)
-        try:
-            skunk = "".join(e for e in bin_8)
-        except TypeError:
+        if len(self) == 0:
             return None
-            
-        num = num % len(skunk)
-        i = 1
-        if num < 0:
-            i = -1
-            
-        for k in range(0, num, i):
-            skunk = skunk[1:] + skunk[0]
-            
-        bit8 = turn_to_6_or_8_bits(skunk, 8)
-        asci = ascii_2_bin_trans(bit8)
-        new_str = "".join([chr(i) for i in asci])
-        
-        return String(new_str)
 
+        return String(strip_last_nul(bits.rotate_left(str_2_bytes(self), num)).decode('latin-1'))
+
+    @_instrumented
+    @_cached
     def decode_cyclic_bits(self, num: int) -> 'String':
         """
         Decode a string that was encoded with cyclic_bits.
@@ -221,24 +361,13 @@ class String(str):
         Returns:
             A new String instance with the original value
         """
-        ascii = str_2_asci_trans(self)
-        bin_8 = ascii_2_bin_trans(ascii, 8)
-        skunk = "".join(e for e in bin_8)
-        
-        num = num % len(skunk)
-        i = 1
-        if num < 0:
-            i = -1
-            
-        for k in range(0, num, i):
-            skunk = skunk[-1] + skunk[:-1]
-            
-        bit8 = turn_to_6_or_8_bits(skunk, 8)
-        asci = ascii_2_bin_trans(bit8)
-        old_str = "".join([chr(i) for i in asci])
-        
-        return String(old_str)
+        if len(self) == 0:
+            return None
 
+        return String(strip_last_nul(bits.rotate_right(str_2_bytes(self), num)).decode('latin-1'))
+
+    @_instrumented
+    @_cached
     def cyclic_chars(self, num: int) -> 'String':
         """
         Transform the String using cyclic character shifting.
@@ -252,38 +381,23 @@ class String(str):
         Raises:
             CyclicCharsError: If the string contains invalid characters
         """
-        ascii = str_2_asci_trans(self)
-        new_ascii = []
-        
-        for i in ascii[:]:
-            if i < 32 or 126 < i:
-                raise CyclicCharsError(self, f"can't use cyclic chars with number {num}")
-                
-            num = valid_num_check(num)
-            if not num and num != 0:
-                return None
-                
-            s = 1
-            if num < 0:
-                s = -1
-                
-            b = (num * s) % 95
-            b *= s
-            i += b
-            
-            if i > 126:
-                i = i - 95
-            if i < 32:
-                i = i + 95
-                
-            new_ascii.append(i)
-            
-        try:
-            new_str = "".join(chr(i) for i in new_ascii)
-            return String(new_str)
-        except (ValueError, TypeError):
+        if len(self) == 0:
+            return String('')
+
+        bad = chars.first_unprintable(self)
+        if bad == 0:
             raise CyclicCharsError(self, f"can't use cyclic chars with number {num}")
 
+        num = valid_num_check(num)
+        if not num and num != 0:
+            return None
+        if bad is not None:
+            raise CyclicCharsError(self, f"can't use cyclic chars with number {num}")
+
+        return String(self.translate(chars.cyclic_table(num % chars.PRINTABLE_COUNT)))
+
+    @_instrumented
+    @_cached
     def decode_cyclic_chars(self, num: int) -> 'String':
         """
         Decode a string that was encoded with cyclic_chars.
@@ -297,38 +411,21 @@ class String(str):
         Raises:
             CyclicCharsDecodeError: If the string contains invalid characters
         """
-        ascii = str_2_asci_trans(self)
-        new_ascii = []
-        
-        for i in ascii[:]:  # 32-126
-            if i < 32 or 126 < i:
-                raise CyclicCharsDecodeError(self, f"can't use decode cyclic chars with number {num}")
-                
-            num = valid_num_check(num)
-            if not num and num != 0:
-                return None
-                
-            s = 1
-            if num < 0:
-                s = -1
-                
-            b = (num * s) % 95
-            b *= s
-            i -= b
-            
-            if i < 32:
-                i = i + 95
-            if i > 126:
-                i = i - 95
-                
-            new_ascii.append(i)
-            
-        try:
-            old_str = "".join(chr(i) for i in new_ascii)
-            return String(old_str)
-        except (ValueError, TypeError):
+        if len(self) == 0:
+            return String('')
+
+        bad = chars.first_unprintable(self)
+        if bad == 0:
             raise CyclicCharsDecodeError(self, f"can't use decode cyclic chars with number {num}")
 
+        num = valid_num_check(num)
+        if not num and num != 0:
+            return None
+        if bad is not None:
+            raise CyclicCharsDecodeError(self, f"can't use decode cyclic chars with number {num}")
+
+        return String(self.translate(chars.cyclic_table(-num % chars.PRINTABLE_COUNT)))
+
     def histogram_of_chars(self) -> dict:
         """
         Calculate the histogram of character types in the String.
@@ -337,32 +434,15 @@ class String(str):
         "other printable", and "higher than 128".
         
         Returns:
-            A dictionary with character categories as keys and counts as values
+            A CharHistogram (a dict) with character categories as keys and
+            counts as values
         """
-        histogram = {
-            'control code': 0,
-            'digits': 0,
-            'upper': 0,
-            'lower': 0,
-            'other printable': 0,
-            'higher than 128': 0
-        }
-        
-        for i in self:
-            if ord(i) in priority()[0] + [32]:
-                histogram['other printable'] += 1
-            if ord(i) in priority()[1]:
-                histogram['digits'] += 1
-            if ord(i) in priority()[2]:
-                histogram['upper'] += 1
-            if ord(i) in priority()[3]:
-                histogram['lower'] += 1
-            if ord(i) in priority()[4]:
-                histogram['higher than 128'] += 1
-            if ord(i) in priority()[5]:
-                histogram['control code'] += 1
-                
-        return histogram
+        return histogram.histogram(self, backend='python')
+
+
+def _wrap(value: str) -> String:
+    """Make a String without rules, skipping __init__."""
+    return str.__new__(String, value)
 
 
 # Base64 translation dictionary
@@ -396,10 +476,19 @@ class Base64Error(Exception):
     def __str__(self):
         return f"<{self.str}> {self.message}"
 
+    def __reduce__(self):
+        """Pickle with both constructor arguments, e.g. across processes."""
+        return self.__class__, (self.str, self.message)
+
 
 class Base64DecodeError(Base64Error):
-    """Exception raised when base64 decoding fails."""
-    pass
+    """
+    Exception raised when base64 decoding fails.
+    
+    Errors raised by validate_base64 also carry the offset of the first bad
+    character.
+    """
+    offset = None
 
 
 class CyclicCharsError(Base64Error):
@@ -422,6 +511,39 @@ class BytePairDecodeError(Base64Error):
     pass
 
 
+def is_valid_base64(s) -> bool:
+    """
+    Check whether String.decode_base64 would accept a string, without decoding it.
+    
+    Args:
+        s: The Base64 text, or a bytes-like object holding it
+        
+    Returns:
+        True if the text decodes to ASCII with decode_base64
+    """
+    return b64.first_invalid(s) is None
+
+
+def validate_base64(s):
+    """
+    Reject text that String.decode_base64 would reject, without decoding it.
+    
+    Args:
+        s: The Base64 text, or a bytes-like object holding it
+        
+    Raises:
+        Base64DecodeError: If the text cannot be decoded. Its offset is the
+            first character outside the alphabet or decoding to a byte above
+            127, or len(s) if the text has no Base64 characters or ends with
+            a lone character.
+    """
+    offset = b64.first_invalid(s)
+    if offset is not None:
+        error = Base64DecodeError(s, f'cannot be decode with base 64 (bad character at offset {offset})')
+        error.offset = offset
+        raise error
+
+
 def valid_num_check(word: int, num=0) -> float or bool:
     """
     Validate that a number is an integer.
@@ -454,14 +576,7 @@ def priority():
     Returns:
         A list of lists, each containing ASCII values for a character group
     """
-    priority = [
-        [i for i in range(33, 48)] + [i for i in range(58, 65)] + [i for i in range(91, 97)] + [124, 125, 126],
-        [i for i in range(48, 58)],
-        [i for i in range(65, 91)],
-        [i for i in range(97, 123)],
-        [i for i in range(128, 256)],
-        [i for i in range(32)] + [127]
-    ]
+    priority = [chars.class_members(cls) for cls in range(6)]
     return priority
 
 
@@ -497,24 +612,44 @@ def group_name(str5):
     Returns:
         List of unique group numbers found in the string
     """
-    gn = []
+    groups = {chars.PUNCT: 1, chars.DIGIT: 2, chars.UPPER: 3}
     try:
-        for i in str5:
-            if ord(i) in priority()[0]:
-                gn.append(1)
-                continue
-            elif ord(i) in priority()[1]:
-                gn.append(2)
-                continue
-            elif ord(i) in priority()[2]:
-                gn.append(3)
-                continue
-            gn.append(4)
-        return list(set(gn))
+        return list({groups.get(chars.char_class(i), 4) for i in set(str5)})
     except TypeError:
         pass
 
 
+def bpe_symbols(b: str, prio: list, valid_groups: list):
+    """
+    Yield the replacement characters for byte pair encoding, in order.
+    
+    Symbols are taken from the priority groups listed in valid_groups. Using
+    up the last available symbol is an error, as in the original algorithm.
+    
+    Args:
+        b: The string being encoded (used in the error message)
+        prio: The priority groups, as returned by priority()
+        valid_groups: Group numbers that may be used for symbols
+        
+    Yields:
+        One replacement character per merge
+        
+    Raises:
+        BytePairError: When no more symbols are available
+    """
+    while True:
+        symbol = chr(prio[valid_groups[0] - 1][0])
+        prio[valid_groups[0] - 1].pop(0)
+        
+        if not prio[valid_groups[0] - 1]:
+            prio.pop(prio.index(prio[valid_groups[0] - 1]))
+            valid_groups.pop(0)
+            if len(valid_groups) == 0:
+                raise BytePairError(b, "can't be used for byte pair encoding.")
+                
+        yield symbol
+
+
 def count_pairs(b: str) -> dict:
     """
     Count adjacent character pairs in a string.
@@ -528,6 +663,7 @@ def count_pairs(b: str) -> dict:
     Raises:
         BytePairError: If the string contains invalid characters
     """
+    b = str(b)  # plain str view: indexing a String makes a String per char
     dict_1 = {}
     skipped = False
     a = [i for i in b if not (0 <= ord(i) <= 255)]
@@ -585,6 +721,37 @@ def turn_to_6_or_8_bits(chunk: list, bits: int) -> list:
         pass
 
 
+def str_2_bytes(b: str) -> bytes:
+    """
+    Convert a string to bytes, keeping the low 8 bits of each character.
+    
+    Args:
+        b: The string to convert
+        
+    Returns:
+        One byte per character
+    """
+    try:
+        return b.encode('latin-1')
+    except UnicodeEncodeError:
+        return bytes(ord(i) & 0xFF for i in str.__iter__(b))
+
+
+def strip_last_nul(b: bytes) -> bytes:
+    """
+    Drop one trailing NUL byte, as the cyclic bits encoders always have.
+    
+    Args:
+        b: The bytes to trim
+        
+    Returns:
+        The bytes without a trailing zero byte
+    """
+    if b and b[-1] == 0:
+        return b[:-1]
+    return b
+
+
 def str_2_asci_trans(b: str or int) -> list or str:
     """
     Convert between string and ASCII values.
@@ -0,0 +1,88 @@
+"""
+Test suite for the asyncio streaming codecs.
+"""
+
+import asyncio
+import concurrent.futures
+import unittest
+from string_encoding import String, aio
+from string_encoding.string import Base64DecodeError, CyclicCharsError
+
+def reader_for(data: bytes) -> asyncio.StreamReader:
+    """Build a StreamReader that already holds data."""
+    reader = asyncio.StreamReader()
+    reader.feed_data(data)
+    reader.feed_eof()
+    return reader
+
+async def chunks_of(data, size):
+    """Yield data in pieces of the given size."""
+    for index in range(0, len(data), size):
+        yield data[index:index + size]
+
+async def collect(pieces) -> bytes:
+    """Join the pieces of an async codec."""
+    return b''.join([piece async for piece in pieces])
+
+def run_async(coro):
+    """Run a coroutine on a new event loop, like asyncio.run (Python 3.7+)."""
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+class TestAio(unittest.TestCase):
+    """Test cases for the async Base64 and cyclic chars codecs."""
+
+    def test_base64(self):
+        """Test async Base64 against the String methods, with and without an executor."""
+        text = "Hello, asyncio! " * 50
+        expected = String(text).base64().encode('ascii')
+
+        async def run():
+            self.assertEqual(await collect(aio.aencode_base64(reader_for(text.encode()), 7)), expected)
+            self.assertEqual(await collect(aio.aencode_base64(chunks_of(text, 5))), expected)
+            with concurrent.futures.ThreadPoolExecutor(2) as executor:
+                encoded = await collect(aio.aencode_base64(reader_for(text.encode()), 30, executor))
+                self.assertEqual(encoded, expected)
+                decoded = await collect(aio.adecode_base64(chunks_of(expected, 9), executor=executor))
+            self.assertEqual(decoded, text.encode())
+            self.assertEqual(await collect(aio.adecode_base64(reader_for(expected[:5] + b'\n=' + expected[5:]), 4)),
+                             text.encode())
+
+            for bad in (b'', b'aGVsb', b'/w' * 9):
+                with self.assertRaises(Base64DecodeError):
+                    await collect(aio.adecode_base64(reader_for(bad)))
+
+        run_async(run())
+
+    def test_cyclic_chars(self):
+        """Test async cyclic chars and writing to a stream writer."""
+        text = "Shift me, please ~ " * 20
+        expected = String(text).cyclic_chars(13).encode('ascii')
+
+        class Writer:
+            def __init__(self):
+                self.data = bytearray()
+
+            def write(self, piece):
+                self.data += piece
+
+            async def drain(self):
+                pass
+
+        async def run():
+            writer = Writer()
+            written = await aio.awrite_all(writer, aio.acyclic_chars(reader_for(text.encode()), 13, 11))
+            self.assertEqual((written, bytes(writer.data)), (len(expected), expected))
+            self.assertEqual(await collect(aio.adecode_cyclic_chars(chunks_of(expected, 8), 13)), text.encode())
+
+            with self.assertRaises(CyclicCharsError) as cm:
+                await collect(aio.acyclic_chars(reader_for(b'ok\tno'), 13))
+            self.assertEqual(cm.exception.message, "can't use cyclic chars with number 13")
+
+        run_async(run())
+
+if __name__ == '__main__':
+    unittest.main()
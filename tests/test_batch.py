@@ -0,0 +1,35 @@
+"""
+Test suite for the batch encoding API.
+"""
+
+import unittest
+from string_encoding import String
+from string_encoding.batch import encode_many
+from string_encoding.string import Base64DecodeError, CyclicCharsError
+
+class TestBatch(unittest.TestCase):
+    """Test cases for encode_many."""
+
+    def test_inline(self):
+        """Test that small batches run inline and keep per-item errors."""
+        results = encode_many(["hello", "a\nb", "xyz"], op='cyclic_chars', args=(5,))
+        self.assertEqual(results[0], String("hello").cyclic_chars(5))
+        self.assertIsInstance(results[1], CyclicCharsError)
+        self.assertEqual(results[2], String("xyz").cyclic_chars(5))
+
+        with self.assertRaises(ValueError):
+            encode_many(["x"], op='lower')
+
+    def test_process_pool(self):
+        """Test that pooled results come back in order with their errors."""
+        items = [f"record {i}" for i in range(50)] + ["a"]
+        results = encode_many(items, op='base64', workers=2, chunksize=7, inline_threshold=0)
+        self.assertEqual(results, [String(item).base64() for item in items])
+
+        decoded = encode_many(results + ["!!"], op='decode_base64', workers=2, inline_threshold=0)
+        self.assertEqual(decoded[:-1], items)
+        self.assertIsInstance(decoded[-1], Base64DecodeError)
+        self.assertEqual(str(decoded[-1]), "<!!> cannot be decode with base 64")
+
+if __name__ == '__main__':
+    unittest.main()
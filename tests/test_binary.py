@@ -0,0 +1,94 @@
+"""
+Test suite for the byte-level encoders.
+"""
+
+import array
+import mmap
+import os
+import tempfile
+import unittest
+from string_encoding import String, b64, binary
+from string_encoding.string import Base64DecodeError, BytePairError, BytePairDecodeError
+
+class TestBinary(unittest.TestCase):
+    """Test cases for the buffer-protocol versions of the String encoders."""
+
+    def test_base64_bytes(self):
+        """Test Base64 over bytes-like inputs and into output buffers."""
+        data = bytes(range(256)) * 3 + b'xy'
+        text = data.decode('latin-1')
+        expected = String(text).base64().encode('ascii')
+        for source in (data, bytearray(data), memoryview(data), array.array('B', data)):
+            self.assertEqual(binary.b64encode_bytes(source), expected)
+
+        out = bytearray(binary.b64_encoded_length(len(data)))
+        self.assertEqual(binary.b64encode_bytes(data, out), len(out))
+        self.assertEqual(out, expected)
+
+        # Decoded bytes above 127 are kept, unlike String.decode_base64.
+        self.assertEqual(binary.b64decode_bytes(expected), data)
+        self.assertEqual(binary.b64decode_bytes(expected[:8] + b'=\n' + expected[8:]), data)
+        out = bytearray(len(data) + 5)
+        self.assertEqual(binary.b64decode_bytes(memoryview(expected), out), len(data))
+        self.assertEqual(out[:len(data)], data)
+        wrapped = memoryview(bytearray(b'\n'.join(expected[i:i + 4] for i in range(0, len(expected), 4))))
+        self.assertEqual(binary.b64decode_bytes(wrapped), data)
+        self.assertEqual(b64.decode_bytes(bytearray(expected)), data)
+
+        with self.assertRaises(ValueError):
+            binary.b64encode_bytes(data, bytearray(3))
+        with self.assertRaises(ValueError):
+            binary.b64encode_bytes(data, bytes(len(expected)))
+        for bad in (b'', b'aGVsb', b'aG!s'):
+            with self.assertRaises(Base64DecodeError):
+                binary.b64decode_bytes(bad)
+
+    def test_base64_blocks(self):
+        """Test that block-wise encoding into a buffer matches one-shot encoding."""
+        data = os.urandom(binary.BLOCK_SIZE * 2 + 7)
+        out = bytearray(binary.b64_encoded_length(len(data)))
+        binary.b64encode_bytes(data, out)
+        self.assertEqual(bytes(out), binary.b64encode_bytes(data))
+
+    def test_cyclic_bits_bytes(self):
+        """Test bit rotation of buffers, including a memory-mapped file."""
+        for text in ("Hello", "a\x00", "\x80\xff\x01", "x"):
+            data = text.encode('latin-1')
+            for num in (0, 1, 7, 8, 13, -3):
+                expected = String(text).cyclic_bits(num).encode('latin-1')
+                self.assertEqual(binary.cyclic_bits_bytes(bytearray(data), num), expected)
+                self.assertEqual(binary.decode_cyclic_bits_bytes(expected, num),
+                                 String(expected.decode('latin-1')).decode_cyclic_bits(num).encode('latin-1'))
+        self.assertEqual(binary.cyclic_bits_bytes(b'', 3), b'')
+
+        with tempfile.TemporaryFile() as f:
+            f.write(b'memory mapped')
+            f.flush()
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                out = bytearray(len(mapped))
+                written = binary.cyclic_bits_bytes(mapped, 5, out)
+                self.assertEqual(binary.decode_cyclic_bits_bytes(memoryview(out)[:written], 5),
+                                 b'memory mapped')
+
+    def test_byte_pair_bytes(self):
+        """Test byte pair encoding of buffers against the String methods."""
+        data = b'aaabdaaabac'
+        encoded, rules = binary.bpe_encode_bytes(memoryview(data))
+        expected = String('aaabdaaabac').byte_pair_encoding()
+        self.assertEqual(encoded, expected.encode('latin-1'))
+        self.assertEqual(rules, expected.rules)
+        self.assertEqual(binary.bpe_decode_bytes(encoded, rules), data)
+
+        out = bytearray(20)
+        self.assertEqual(binary.bpe_decode_bytes(bytearray(encoded), rules, out), len(data))
+        self.assertEqual(out[:len(data)], data)
+
+        with self.assertRaises(BytePairError):
+            binary.bpe_encode_bytes(b'a')
+        with self.assertRaises(BytePairDecodeError):
+            binary.bpe_decode_bytes(encoded, ['bad rule'])
+        with self.assertRaises(BytePairDecodeError):
+            binary.bpe_decode_bytes(encoded, [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+"""
+Test suite for the byte pair container format.
+"""
+
+import os
+import tempfile
+import unittest
+from string_encoding import String, bpefile
+from string_encoding.string import BytePairError, BytePairDecodeError
+
+class TestBytePairFile(unittest.TestCase):
+    """Test cases for writing and reading byte pair containers."""
+
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp()
+        os.close(handle)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_round_trip(self):
+        """Test that a saved payload loads back with the same text and rules."""
+        original = String("the cat sat on the mat " * 4)
+        encoded = original.byte_pair_encoding()
+        encoded.save_bpe(self.path)
+        self.assertEqual(os.path.getsize(self.path),
+                         bpefile.HEADER.size + 3 * len(encoded.rules) + len(encoded))
+
+        loaded = String.load_bpe(self.path)
+        self.assertEqual(loaded, encoded)
+        self.assertEqual(loaded.rules, encoded.rules)
+        self.assertEqual(loaded.decode_byte_pair(), original)
+
+        with bpefile.BytePairFile(self.path) as fh:
+            self.assertEqual(''.join(fh.iter_decode(chunk_size=3)), original)
+
+        self.assertEqual(bpefile.loads(bpefile.dumps(encoded, encoded.rules)), (encoded, encoded.rules))
+
+    def test_invalid(self):
+        """Test that bad payloads and bad files are rejected."""
+        with self.assertRaises(BytePairError):
+            String("ab", ["avocad=baan"]).save_bpe(self.path)
+        with open(self.path, 'wb') as fh:
+            fh.write(b'SEBP\x02')
+        with self.assertRaises(BytePairDecodeError):
+            String.load_bpe(self.path)
+
+if __name__ == '__main__':
+    unittest.main()
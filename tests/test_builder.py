@@ -0,0 +1,57 @@
+"""
+Test suite for StringBuilder.
+"""
+
+import unittest
+from string_encoding import String, StringBuilder
+from string_encoding.string import Base64DecodeError, CyclicCharsError
+
+class TestStringBuilder(unittest.TestCase):
+    """Test cases for StringBuilder."""
+
+    def test_build(self):
+        """Test that parts are joined once into a String."""
+        builder = StringBuilder(["Hello", String(", ")])
+        builder.append("World").extend(["", "!"])
+        builder += "?"
+        self.assertEqual(len(builder), 14)
+        built = builder.build()
+        self.assertIsInstance(built, String)
+        self.assertEqual(built, "Hello, World!?")
+        self.assertEqual(builder.build(), built)
+        self.assertEqual(str(builder), "Hello, World!?")
+        with self.assertRaises(TypeError):
+            builder.append(b"bytes")
+
+    def test_methods_match_string(self):
+        """Test that every method gives the result of the built String."""
+        parts = ["aaab", "daaa", "bac ", "Hello ", "World"] * 7
+        text = String("".join(parts))
+        for chunk_size in (1, 3, 1 << 16):
+            builder = StringBuilder(parts, chunk_size=chunk_size)
+            self.assertEqual(builder.base64(), text.base64())
+            self.assertEqual(StringBuilder([text.base64()[:5], text.base64()[5:]]).decode_base64(), text)
+            self.assertEqual(builder.cyclic_chars(7), text.cyclic_chars(7))
+            self.assertEqual(builder.decode_cyclic_chars(7), text.decode_cyclic_chars(7))
+            self.assertEqual(builder.cyclic_bits(3), text.cyclic_bits(3))
+            self.assertEqual(builder.histogram_of_chars(), text.histogram_of_chars())
+
+        encoded = String("aaabdaaabac").byte_pair_encoding()
+        builder = StringBuilder(["aaab", "daaabac"])
+        self.assertEqual((builder.byte_pair_encoding(), builder.byte_pair_encoding().rules),
+                         (encoded, encoded.rules))
+        self.assertEqual(StringBuilder([encoded[:2], encoded[2:]], rules=encoded.rules).decode_byte_pair(),
+                         "aaabdaaabac")
+
+    def test_errors_and_edge_cases(self):
+        """Test errors and the empty and non-integer cases of the String methods."""
+        with self.assertRaises(Base64DecodeError):
+            StringBuilder(["aGVs", "b"]).decode_base64()
+        with self.assertRaises(CyclicCharsError):
+            StringBuilder(["ok", "\n"]).cyclic_chars(3)
+        self.assertEqual(StringBuilder(["a", "bc"]).cyclic_chars(2.5), String("abc").cyclic_chars(2.5))
+        self.assertIsNone(StringBuilder().cyclic_bits(1))
+        self.assertEqual(StringBuilder().cyclic_chars(1), "")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+"""
+Test suite for the result cache.
+"""
+
+import contextlib
+import io
+import threading
+import unittest
+from string_encoding import String, cache
+
+class TestCache(unittest.TestCase):
+    """Test cases for ResultCache and the cached String methods."""
+
+    def setUp(self):
+        self.store = cache.enable()
+
+    def tearDown(self):
+        cache.disable()
+
+    def test_hits_and_rules(self):
+        """Test that repeated calls hit the cache and keep the rules."""
+        s = String("aaabdaaabac")
+        first = s.byte_pair_encoding()
+        second = String("aaabdaaabac").byte_pair_encoding()
+        self.assertEqual((second, second.rules), (first, first.rules))
+        self.assertIsNot(second.rules, first.rules)
+        self.assertEqual(second.decode_byte_pair(), "aaabdaaabac")
+
+        self.assertEqual(s.cyclic_chars(3), s.cyclic_chars(3))
+        self.assertNotEqual(s.cyclic_chars(3), s.cyclic_chars(4))
+        self.assertEqual(s.base64().decode_base64(), s)
+        stats = self.store.stats()
+        self.assertEqual((stats.hits, stats.misses), (3, 6))
+
+        # Same content, different rules: a different decode entry
+        self.assertNotEqual(String(first, ['z = ab']).decode_byte_pair(), "aaabdaaabac")
+
+    def test_same_as_uncached(self):
+        """Test that argument types and printed diagnostics do not depend on the cache."""
+        s = String("cache me")
+        s.cyclic_bits(3)
+        with self.assertRaises(TypeError):
+            s.cyclic_bits(3.0)
+        for _ in range(2):
+            with contextlib.redirect_stdout(io.StringIO()) as out:
+                s.cyclic_chars(2.5)
+            self.assertIn('Please enter a valid number.', out.getvalue())
+        self.assertEqual(self.store.stats().entries, 1)
+
+        # A byte pair result without merges keeps its own mutable rules list
+        for _ in range(2):
+            encoded = String("abcd").byte_pair_encoding()
+            self.assertIs(type(encoded.rules), list)
+            encoded.rules.append("X = ab")
+        self.assertEqual(self.store.stats().hits, 1)
+        self.assertIs(String("aaaa").cyclic_chars(1).rules, String("x").rules)
+
+    def test_eviction(self):
+        """Test byte-based LRU eviction and its statistics."""
+        store = cache.ResultCache(max_bytes=200)
+        for i in range(10):
+            store.put(cache.content_key('base64', (), str(i)), 'x' * 100)
+        stats = store.stats()
+        self.assertLessEqual(stats.size, 200)
+        self.assertEqual(stats.evictions, 10 - stats.entries)
+        self.assertIsNone(store.get(cache.content_key('base64', (), '0')))
+        self.assertEqual(store.get(cache.content_key('base64', (), '9')), ('x' * 100, None))
+
+        store.put(cache.content_key('base64', (), 'big'), 'x' * 1000)
+        self.assertIsNone(store.get(cache.content_key('base64', (), 'big')))
+        store.clear()
+        self.assertEqual(store.stats()[:5], (0, 0, 0, 0, 0))
+
+    def test_threads(self):
+        """Test that threads sharing the cache see consistent results."""
+        texts = [String(f"payload {i % 5}") for i in range(200)]
+        expected = {str(t): t.cyclic_chars(9) for t in texts}
+        errors = []
+
+        def work(chunk):
+            for t in chunk:
+                if t.cyclic_chars(9) != expected[str(t)]:
+                    errors.append(t)
+
+        threads = [threading.Thread(target=work, args=(texts[i::4],)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(self.store.stats().entries, 5)
+
+if __name__ == '__main__':
+    unittest.main()
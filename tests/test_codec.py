@@ -0,0 +1,115 @@
+"""
+Test suite for the stdlib codec registration.
+"""
+
+import codecs
+import io
+import os
+import tempfile
+import unittest
+from string_encoding import String
+
+class TestCodec(unittest.TestCase):
+    """Test cases for the se-* text encodings."""
+
+    def test_matches_string_methods(self):
+        """Test that each codec encodes like its String method and round trips."""
+        text = "Hello, World! ~ all printable"
+        self.assertEqual(text.encode('se-base64'), String(text).base64().encode('ascii'))
+        self.assertEqual(text.encode('se-cyclic-chars-7'), String(text).cyclic_chars(7).encode('ascii'))
+        self.assertEqual(text.encode('SE_Cyclic_Bits-3'), String(text).cyclic_bits(3).encode('latin-1'))
+        for name in ('se-base64', 'se-cyclic-chars-7', 'se-cyclic-chars-200', 'se-cyclic-bits-3'):
+            self.assertEqual(text.encode(name).decode(name), text)
+            pieces = codecs.iterencode(iter([text[:5], text[5:9], text[9:]]), name, buffered=True)
+            self.assertEqual(b''.join(pieces), text.encode(name))
+            encoded = text.encode(name)
+            chunks = [encoded[i:i + 3] for i in range(0, len(encoded), 3)]
+            self.assertEqual(''.join(codecs.iterdecode(iter(chunks), name)), text)
+
+        with self.assertRaises(LookupError):
+            codecs.lookup('se-cyclic-chars-x')
+
+    def test_errors(self):
+        """Test error handling, including the se-passthrough handler."""
+        with self.assertRaises(UnicodeEncodeError):
+            "tab\there".encode('se-cyclic-chars-7')
+        with self.assertRaises(UnicodeDecodeError):
+            b'aGVsb'.decode('se-base64')
+        with self.assertRaises(UnicodeDecodeError):
+            b'/w'.decode('se-base64')
+        self.assertEqual("a\tb".encode('se-cyclic-chars-1', 'replace'), b'b?c')
+        self.assertEqual("a\nb".encode('se-cyclic-chars-1', 'se-passthrough'), b'b\nc')
+        self.assertEqual(b'b\nc'.decode('se-cyclic-chars-1', 'se-passthrough'), "a\nb")
+        self.assertEqual(b''.decode('se-base64'), '')
+
+    def test_open(self):
+        """Test reading and writing files through open()."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'data.txt')
+            with open(path, 'w', encoding='se-cyclic-chars-7', errors='se-passthrough') as fh:
+                fh.write("line one\nline two\n")
+            with open(path, 'rb') as fh:
+                self.assertEqual(fh.read(), b"spul'vul\nspul'{~v\n")
+            with open(path, encoding='se-cyclic-chars-7', errors='se-passthrough') as fh:
+                self.assertEqual(fh.readlines(), ["line one\n", "line two\n"])
+
+            text = "x" * 10000 + "yz"
+            for name in ('se-base64', 'se-cyclic-bits-5'):
+                with open(path, 'wb') as fh:
+                    for piece in codecs.iterencode(iter([text[:4097], text[4097:]]), name,
+                                                   buffered=True):
+                        fh.write(piece)
+                with open(path, encoding=name) as fh:
+                    self.assertEqual(fh.read(), text)
+
+            # open() never makes the final encoder call, so text that would
+            # have to wait for it is refused instead of silently dropped
+            with open(path, 'w', encoding='se-base64') as fh:
+                fh.write("hello world!")
+            with open(path, encoding='se-base64') as fh:
+                self.assertEqual(fh.read(), "hello world!")
+            for name, written in (('se-base64', "hello world!!"), ('se-cyclic-bits-3', "hello")):
+                with self.assertRaises(UnicodeEncodeError):
+                    with open(path, 'w', encoding=name) as fh:
+                        fh.write(written)
+                        fh.flush()
+            with self.assertRaises(UnicodeEncodeError):
+                list(codecs.iterencode(iter(["hell", "o"]), 'se-base64'))
+            self.assertEqual(b''.join(codecs.iterencode(iter(["hel", "lo!"]), 'se-base64')),
+                             "hello!".encode('se-base64'))
+
+    def test_stream_coders(self):
+        """Test chunked reads and several writes through the stream coders."""
+        text = "hello world\nchunked stream text\nend"
+        for name in ('se-base64', 'se-cyclic-chars-7', 'se-cyclic-bits-5'):
+            errors = 'se-passthrough' if name == 'se-cyclic-chars-7' else 'strict'
+            encoded = text.encode(name, errors)
+            reader = codecs.getreader(name)(io.BytesIO(encoded), errors)
+            pieces = iter(lambda: reader.read(10), '')
+            self.assertEqual(''.join(pieces), text)
+            reader = codecs.getreader(name)(io.BytesIO(encoded), errors)
+            self.assertEqual(reader.readlines(), text.splitlines(keepends=True))
+
+            out = io.BytesIO()
+            writer = codecs.getwriter(name)(out, errors)
+            writer.write(text[:6])
+            if name == 'se-cyclic-bits-5':
+                # The whole text is rotated, so the first write ends the stream
+                with self.assertRaises(UnicodeEncodeError):
+                    writer.write(text[6:])
+                self.assertEqual(out.getvalue(), text[:6].encode(name))
+                continue
+            writer.write(text[6:12])
+            writer.write(text[12:])
+            self.assertEqual(out.getvalue(), encoded)
+
+        # A partial Base64 group ends the stream instead of corrupting it
+        out = io.BytesIO()
+        writer = codecs.getwriter('se-base64')(out)
+        writer.write(text[:7])
+        with self.assertRaises(UnicodeEncodeError):
+            writer.write(text[7:])
+        self.assertEqual(out.getvalue().decode('se-base64'), text[:7])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+"""
+Test suite for character-class histograms.
+"""
+
+import unittest
+from string_encoding import String
+from string_encoding.histogram import CharHistogram, RollingCharHistogram, histogram, np
+
+class TestHistogram(unittest.TestCase):
+    """Test cases for CharHistogram and the histogram backends."""
+
+    def test_matches_histogram_of_chars(self):
+        """Test that every input type gives the histogram_of_chars bins."""
+        text = "Hello 123, {World}!\x01\x7f\xe9\xffĀ"
+        expected = String(text).histogram_of_chars()
+        self.assertIsInstance(expected, CharHistogram)
+        self.assertEqual(histogram(text), expected)
+
+        data = text[:-1].encode('latin-1')
+        self.assertEqual(histogram(data), String(text[:-1]).histogram_of_chars())
+        self.assertEqual(histogram(memoryview(data)), histogram(bytearray(data)))
+
+    def test_merge(self):
+        """Test that per-chunk histograms add up to the whole."""
+        text = "Chunked TEXT 42 with\tcontrol\x00codes\xf0"
+        parts = [histogram(text[i:i + 5]) for i in range(0, len(text), 5)]
+        self.assertEqual(sum(parts, CharHistogram()), histogram(text))
+        self.assertEqual(sum(parts), histogram(text))
+        self.assertIsNot(sum(parts[:1]), parts[0])
+
+        merged = CharHistogram()
+        merged += parts[0]
+        merged.merge(parts[1])
+        self.assertEqual(merged, parts[0] + parts[1])
+        self.assertEqual(merged.total(), 10)
+
+    def test_rolling_size_window(self):
+        """Test that a size window matches the histogram of the stream's tail."""
+        stream = "Log line 42\n\x00\xe9Ā{WARN} ok " * 20
+        window = RollingCharHistogram(size=37)
+        seen = ""
+        for i, n in enumerate([1, 5, 0, 40, 3, 17, 100, 2] * 8):
+            chunk = stream[i * 7:i * 7 + n]
+            window.update(chunk)
+            seen += chunk
+            self.assertEqual(window.histogram(), histogram(seen[-37:]))
+            self.assertEqual(len(window), len(seen[-37:]))
+
+        window = RollingCharHistogram(size=4).update(b"ab\x01\xff").update(bytearray(b"CD"))
+        self.assertEqual(window.histogram(), histogram(b"\x01\xffCD"))
+        self.assertEqual(window.ratio('higher than 128'), 0.25)
+
+    def test_rolling_time_window(self):
+        """Test that a time window evicts whole chunks once they are too old."""
+        now = [0.0]
+        window = RollingCharHistogram(seconds=10, clock=lambda: now[0])
+        window.update("ABC")
+        now[0] = 5
+        window.update("\x00\x00")
+        self.assertEqual(window.ratio('control code'), 0.4)
+        now[0] = 10
+        self.assertEqual(window.histogram(), histogram("\x00\x00"))
+        self.assertEqual(window.ratio('control code', now=20), 0.0)
+        self.assertEqual(len(window), 0)
+        with self.assertRaises(ValueError):
+            RollingCharHistogram()
+        with self.assertRaises(KeyError):
+            window.ratio('vowels')
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_numpy_backend(self):
+        """Test that the numpy backend agrees with the pure Python one."""
+        text = "Hello 123, {World}!\x01\x7f\xe9\xffĀ" * 3
+        self.assertEqual(histogram(text, backend='numpy'), histogram(text, backend='python'))
+        codes = np.array([ord(c) for c in text], dtype=np.uint32)
+        self.assertEqual(histogram(codes), histogram(text))
+        data = np.frombuffer(text[:-1].encode('latin-1', 'ignore'), dtype=np.uint8)
+        self.assertEqual(histogram(data), histogram(data.tobytes(), backend='python'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+"""
+Test suite for the instrumentation of the String methods.
+"""
+
+import unittest
+from string_encoding import String, metrics
+from string_encoding.string import Base64DecodeError
+
+class TestMetrics(unittest.TestCase):
+    """Test cases for Recorder and the instrumented String methods."""
+
+    def tearDown(self):
+        metrics.disable()
+
+    def test_counts_and_sizes(self):
+        """Test call counts, bytes in/out and the time histogram."""
+        recorder = metrics.enable()
+        s = String("Hello, World!")
+        encoded = s.base64()
+        encoded.decode_base64()
+        s.base64()
+        s.cyclic_chars(3)
+
+        stats = recorder.snapshot()
+        self.assertEqual(set(stats), {'base64', 'decode_base64', 'cyclic_chars'})
+        self.assertEqual(stats['base64'].calls, 2)
+        self.assertEqual(stats['base64'].bytes_in, 2 * len(s))
+        self.assertEqual(stats['base64'].bytes_out, 2 * len(encoded))
+        self.assertEqual(stats['decode_base64'].bytes_out, len(s))
+        self.assertEqual(sum(stats['base64'].histogram), 2)
+        self.assertEqual(len(stats['base64'].histogram), len(metrics.DEFAULT_BUCKETS) + 1)
+        self.assertEqual(stats['base64'].errors, {})
+
+    def test_errors_sink_and_reset(self):
+        """Test exception counts, the sink callback and snapshot/reset."""
+        calls = []
+        recorder = metrics.enable(sink=calls.append)
+        with self.assertRaises(Base64DecodeError):
+            String("a").decode_base64()
+        self.assertIsNone(String("").cyclic_bits(2))
+
+        self.assertEqual([call.op for call in calls], ['decode_base64', 'cyclic_bits'])
+        self.assertIsInstance(calls[0].error, Base64DecodeError)
+        self.assertEqual((calls[1].bytes_out, calls[1].error), (0, None))
+
+        stats = recorder.snapshot(reset=True)
+        self.assertEqual(stats['decode_base64'].errors, {'Base64DecodeError': 1})
+        self.assertEqual(recorder.snapshot(), {})
+
+        String("abc").cyclic_chars(1)
+        recorder.reset()
+        self.assertEqual(recorder.snapshot(), {})
+
+    def test_failing_sink(self):
+        """Test that a failing sink neither breaks calls nor masks their errors."""
+        def sink(call):
+            raise RuntimeError('exporter down')
+
+        recorder = metrics.enable(sink=sink)
+        with self.assertLogs('string_encoding.metrics', 'ERROR'):
+            self.assertEqual(String("abc").cyclic_chars(1), "bcd")
+        with self.assertLogs('string_encoding.metrics', 'ERROR'):
+            with self.assertRaises(Base64DecodeError):
+                String("a").decode_base64()
+        self.assertEqual(recorder.snapshot()['decode_base64'].errors, {'Base64DecodeError': 1})
+
+    def test_disabled(self):
+        """Test that nothing is recorded once instrumentation is off."""
+        recorder = metrics.enable()
+        metrics.disable()
+        String("abc").base64()
+        self.assertEqual(recorder.snapshot(), {})
+
+    def test_buckets(self):
+        """Test histogram bucketing and bucket validation."""
+        recorder = metrics.Recorder(buckets=(0.1, 1.0))
+        for seconds in (0.05, 0.1, 0.5, 5.0):
+            recorder.record('base64', 1, 1, seconds)
+        self.assertEqual(recorder.snapshot()['base64'].histogram, (2, 1, 1))
+        with self.assertRaises(ValueError):
+            metrics.Recorder(buckets=(1.0, 1.0))
+
+if __name__ == '__main__':
+    unittest.main()
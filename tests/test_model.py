@@ -0,0 +1,37 @@
+"""
+Test suite for the BytePairModel class.
+"""
+
+import unittest
+from string_encoding import String, BytePairModel
+from string_encoding.string import BytePairError
+
+class TestBytePairModel(unittest.TestCase):
+    """Test cases for training and applying byte pair models."""
+
+    def test_train_matches_byte_pair_encoding(self):
+        """Test that a trained model reproduces byte_pair_encoding on its corpus."""
+        corpus = "aaabbbcccaaabbbccc"
+        model = BytePairModel.train(corpus)
+        encoded = String(corpus).byte_pair_encoding()
+        self.assertEqual(model.rules, encoded.rules)
+        self.assertEqual(model.encode(corpus), encoded)
+
+    def test_apply_many(self):
+        """Test encoding and decoding other strings with one model."""
+        model = BytePairModel.train(["thecatsatonthemat", "thedogsatonthelog"] * 3)
+        for text in ("thecatsatonthelog", "hat", "", "x"):
+            encoded = model.encode(text)
+            self.assertIs(encoded.rules, model.rules)
+            expected = text
+            for rule in model.rules:
+                expected = expected.replace(rule[4:], rule[0])
+            self.assertEqual(encoded, expected)
+            self.assertEqual(model.decode(encoded), text)
+
+        # Strings holding a replacement symbol cannot be encoded
+        with self.assertRaises(BytePairError):
+            model.encode(model.rules[0][0])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+"""
+Test suite for parallel Base64 and pair counting over shared memory.
+"""
+
+import contextlib
+import io
+import random
+import unittest
+from unittest import mock
+from string_encoding import String, bpe, parallel
+from string_encoding.string import Base64DecodeError, BytePairError, count_pairs
+
+@unittest.skipIf(parallel.shared_memory is None, "shared_memory needs Python 3.8+")
+class TestParallel(unittest.TestCase):
+    """Test cases for the shared-memory Base64 encoder and decoder."""
+
+    def test_encode_matches_string(self):
+        """Test that sliced encoding matches String.base64 for every tail length."""
+        for size in (1, 2, 3, 10, 11, 12, 100):
+            text = ''.join(chr(i % 256) for i in range(size))
+            self.assertEqual(parallel.encode_base64(text, workers=3, threshold=0),
+                             String(text).base64())
+            self.assertEqual(parallel.encode_base64(text.encode('latin-1'), workers=3, threshold=0),
+                             String(text).base64())
+
+        # Empty input is handled the same way for str and bytes, quietly
+        for empty in ("", b""):
+            with contextlib.redirect_stdout(io.StringIO()) as out:
+                self.assertEqual(parallel.encode_base64(empty, workers=3, threshold=0), "")
+            self.assertEqual(out.getvalue(), "")
+
+    def test_decode_matches_string(self):
+        """Test that sliced decoding matches String.decode_base64."""
+        for size in (1, 2, 3, 10, 11, 12, 100):
+            text = ''.join(chr(32 + i % 95) for i in range(size))
+            encoded = String(text).base64()
+            self.assertEqual(parallel.decode_base64(encoded + "=\n", workers=3, threshold=0), text)
+
+        for bad in ("", "aGVsb", "aG!sbG8g", "/w" * 9):
+            with self.assertRaises(Base64DecodeError):
+                parallel.decode_base64(bad, workers=2, threshold=0)
+
+    def test_count_pairs_matches_legacy(self):
+        """Test that sharded pair counts and merges equal the single-shard ones."""
+        rnd = random.Random(7)
+        samples = ["", "a", "aaa", "aaabaaa", "abaaab", "aabbbaaab", "xaaxaaa"]
+        samples += [''.join(rnd.choice("aab c") * rnd.choice([1, 2, 3]) for _ in range(60))
+                    for _ in range(20)]
+        for sample in samples:
+            expected = list(count_pairs(sample).items())
+            self.assertEqual(list(bpe.pair_counts(sample).items()), expected)
+            self.assertEqual(list(parallel.count_pairs(sample, workers=3, threshold=0).items()),
+                             expected)
+            for cut in range(1, len(sample) - 1, 7):
+                shards = [bpe.index_shard(sample[:cut + 1]), bpe.index_shard(sample[cut:], cut)]
+                self.assertEqual(list(bpe.pair_counts(sample, shards).items()), expected)
+
+            learned = bpe.learn(sample, iter("!#$%&()*+,-.0123456789"))
+            shards = parallel.index_shards(sample, workers=3, threshold=0)
+            self.assertEqual(bpe.learn(sample, iter("!#$%&()*+,-.0123456789"), shards), learned)
+
+        with self.assertRaises(BytePairError):
+            parallel.count_pairs("ab\u0100", workers=2, threshold=0)
+
+    def test_byte_pair_encoding_stays_in_process(self):
+        """Test that byte_pair_encoding never starts worker processes by itself."""
+        text = String("the cat sat on the mat " * 50)
+        with mock.patch('concurrent.futures.ProcessPoolExecutor', side_effect=AssertionError), \
+                mock.patch.object(parallel, 'index_shards', side_effect=AssertionError), \
+                mock.patch('os.cpu_count', return_value=4):
+            encoded = text.byte_pair_encoding()
+        self.assertEqual(encoded.decode_byte_pair(), text)
+
+if __name__ == '__main__':
+    unittest.main()
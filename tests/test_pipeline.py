@@ -0,0 +1,82 @@
+"""
+Test suite for fused transformation pipelines.
+"""
+
+import contextlib
+import io
+import unittest
+from unittest import mock
+from string_encoding import String, Pipeline
+from string_encoding.string import Base64DecodeError, CyclicCharsError
+
+class TestPipeline(unittest.TestCase):
+    """Test cases for the Pipeline class."""
+
+    def test_matches_chained_methods(self):
+        """Test that pipelines give the same result as chained method calls."""
+        text = "The quick brown fox jumps over the lazy dog" * 5
+        s = String(text)
+        cases = [
+            (Pipeline().cyclic_chars(7).base64(), s.cyclic_chars(7).base64()),
+            (Pipeline().cyclic_chars(7).decode_cyclic_chars(2).cyclic_chars(100),
+             s.cyclic_chars(7).decode_cyclic_chars(2).cyclic_chars(100)),
+            (Pipeline().base64().cyclic_chars(3), s.base64().cyclic_chars(3)),
+            (Pipeline().cyclic_bits(8).base64(), s.cyclic_bits(8).base64()),
+            (Pipeline().base64().base64(), s.base64().base64()),
+        ]
+        for pipeline, expected in cases:
+            for chunk_size in (1, 7, 12, 1 << 16):
+                self.assertEqual(pipeline.run(s, chunk_size), expected)
+                self.assertEqual(pipeline.inverse().run(expected, chunk_size), text)
+
+        # decode_base64 rejects bytes above 127, so only the forward run here
+        self.assertEqual(Pipeline().cyclic_bits(5).base64().run(s, 12), s.cyclic_bits(5).base64())
+
+        # Fused shifts are one translate step
+        self.assertEqual(len(Pipeline().cyclic_chars(7).cyclic_chars(3).base64()._compile()), 2)
+
+    def test_byte_pair_rules(self):
+        """Test that byte pair rules travel on the run result."""
+        text = "aaabdaaabac"
+        pipeline = Pipeline().byte_pair_encoding().base64()
+        encoded = pipeline.run(text)
+        expected = String(text).byte_pair_encoding()
+        self.assertEqual(encoded, expected.base64())
+        self.assertEqual(encoded.rules, expected.rules)
+        self.assertEqual(pipeline.inverse().run(encoded), text)
+
+        with self.assertRaises(ValueError):
+            Pipeline().byte_pair_encoding().decode_byte_pair()
+        with self.assertRaises(ValueError):
+            pipeline.iter_run([text])
+
+    def test_iter_run_and_errors(self):
+        """Test streaming runs and the errors of failing steps."""
+        pipeline = Pipeline().cyclic_chars(4).base64()
+        text = "streamed text " * 100
+        pieces = list(pipeline.iter_run(io.StringIO(text), chunk_size=30))
+        self.assertGreater(len(pieces), 1)
+        self.assertEqual(''.join(pieces), String(text).cyclic_chars(4).base64())
+
+        with self.assertRaises(CyclicCharsError) as cm:
+            Pipeline().cyclic_chars(4).base64().run("ok\tno")
+        self.assertEqual(cm.exception.message, "can't use cyclic chars with number 4")
+        with self.assertRaises(Base64DecodeError):
+            Pipeline().decode_base64().run("a")
+        self.assertEqual(Pipeline().cyclic_bits(3).base64().run(""), "")
+
+        # Non-integer shifts fall back to the String method; a failed step
+        # raises instead of passing on an empty string
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(Pipeline().cyclic_chars(2.5).base64().run("abc"),
+                             String("abc").cyclic_chars(2.5).base64())
+        with mock.patch.object(String, 'cyclic_chars', return_value=None):
+            with self.assertRaises(CyclicCharsError) as cm:
+                Pipeline().cyclic_chars(2.5).base64().run("abc")
+        self.assertEqual(cm.exception.message, "can't use cyclic chars with number 2.5")
+
+        self.assertEqual(repr(pipeline), "Pipeline().cyclic_chars(4).base64()")
+        self.assertEqual(pipeline, Pipeline([('cyclic_chars', (4,)), ('base64', ())]))
+
+if __name__ == '__main__':
+    unittest.main()
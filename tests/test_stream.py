@@ -0,0 +1,42 @@
+"""
+Test suite for the streaming Base64 functions.
+"""
+
+import io
+import unittest
+from string_encoding import String
+from string_encoding.string import Base64DecodeError
+from string_encoding.stream import base64_encode, base64_decode
+
+class TestStream(unittest.TestCase):
+    """Test cases for streaming Base64 encoding and decoding."""
+
+    def test_encode_matches_string(self):
+        """Test that chunked encoding matches String.base64."""
+        text = "Streaming chunks of log lines!\n" * 7
+        for chunk_size in (1, 2, 3, 4, 5, 7, 64):
+            dst = io.StringIO()
+            base64_encode(io.BytesIO(text.encode('ascii')), dst, chunk_size=chunk_size)
+            self.assertEqual(dst.getvalue(), String(text).base64())
+
+        # Iterables of str chunks and binary destinations
+        dst = io.BytesIO()
+        base64_encode(["ab", "c", "defg"], dst)
+        self.assertEqual(dst.getvalue(), String("abcdefg").base64().encode('ascii'))
+
+    def test_decode_matches_string(self):
+        """Test that chunked decoding matches String.decode_base64."""
+        text = "Streaming chunks of log lines!\n" * 7
+        encoded = String(text).base64()
+        for chunk_size in (1, 2, 3, 4, 5, 7, 64):
+            dst = io.StringIO()
+            base64_decode(io.StringIO(encoded), dst, chunk_size=chunk_size)
+            self.assertEqual(dst.getvalue(), text)
+
+        # Same rejection rules as the one-shot decoder
+        for bad in ("", "aGVsb", "aG!s", "/w=="):
+            with self.assertRaises(Base64DecodeError):
+                base64_decode([bad], io.StringIO())
+
+if __name__ == '__main__':
+    unittest.main()
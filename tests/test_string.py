@@ -2,8 +2,13 @@
 Test suite for the String-Encoding module.
 """
 
+import contextlib
+import io
+import pickle
 import unittest
-from string_encoding import String
+from string_encoding import String, is_valid_base64, validate_base64
+from string_encoding import b64, bits, bpe, chars
+from string_encoding.string import count_pairs, group_name, priority, Base64DecodeError, CyclicCharsError
 
 class TestStringEncoding(unittest.TestCase):
     """Test cases for the String class encoding methods."""
@@ -27,7 +32,41 @@ class TestStringEncoding(unittest.TestCase):
         encoded_special = special.base64()
         decoded_special = encoded_special.decode_base64()
         self.assertEqual(decoded_special, special)
-    
+
+    def test_base64_engine(self):
+        """Test the table-driven base64 engine against the standard library."""
+        import base64
+        for n in range(1, 10):
+            data = bytes(range(200, 200 + n))
+            expected = base64.b64encode(data).decode('ascii').rstrip('=')
+            self.assertEqual(b64.encode(data), expected)
+            self.assertEqual(b64.decode(expected), data)
+
+        # Control codes and '=' are skipped, a lone trailing char is invalid
+        self.assertEqual(String("aGVs\nbG8=").decode_base64(), "hello")
+        self.assertIsNone(b64.decode("aGVsb"))
+        self.assertIsNone(b64.decode("aG!s"))
+
+    def test_validate_base64(self):
+        """Test that validation agrees with decode_base64 and reports offsets."""
+        samples = ["aGVsbG8", "aGVs\nbG8=", "aGVsb", "aG!s", "", "==\n", "/w", "/w==", "aP8",
+                   "aGVsbG8gd29ybGQ", "aGVs\x00\x7fbG8gd29ybGQ=="]
+        for sample in samples:
+            try:
+                String(sample).decode_base64()
+                valid = True
+            except Base64DecodeError:
+                valid = False
+            self.assertEqual(is_valid_base64(sample), valid, sample)
+            self.assertEqual(is_valid_base64(sample.encode('ascii')), valid, sample)
+
+        # Outside the alphabet, lone trailing character, decodes above 127
+        for sample, offset in [("aG!s", 2), ("aGVsb", 5), ("", 0), ("aGVz\n/w", 5), ("aP8A", 1)]:
+            with self.assertRaises(Base64DecodeError) as cm:
+                validate_base64(sample)
+            self.assertEqual(cm.exception.offset, offset, sample)
+        self.assertIsNone(validate_base64(bytearray(b"aGVs\nbG8=")))
+
     def test_byte_pair_encoding(self):
         """Test byte pair encoding and decoding."""
         # Test string with repeating patterns
@@ -46,7 +85,36 @@ class TestStringEncoding(unittest.TestCase):
         except Exception as e:
             # It's okay if this raises an exception for strings with no repeating patterns
             pass
-    
+
+    def test_byte_pair_engine(self):
+        """Test the incremental pair index against repeated count_pairs calls."""
+        samples = ["aaa", "aaaa", "aaaxbbb", "aab aaa", "abababab", "the cat sat on the mat " * 5,
+                   "xx aaa yyy aaa zz aaaaa"]
+        for sample in samples:
+            str1, rules = sample, []
+            symbols = iter("!#$%&()*+,-.0123456789")
+            counter = count_pairs(str1)
+            s = max(counter.items(), key=lambda x: x[1])
+            while s[1] > 1:
+                symbol = next(symbols)
+                rules.append(f'{symbol} = {s[0]}')
+                str1 = str1.replace(s[0], symbol)
+                counter = count_pairs(str1)
+                s = max(counter.items(), key=lambda x: x[1])
+            self.assertEqual(bpe.learn(sample, iter("!#$%&()*+,-.0123456789")), (str1, rules))
+
+    def test_decode_byte_pair_compiled(self):
+        """Test single-pass decoding, including rules whose pairs hold spaces."""
+        test_str = String("the cat sat on the mat " * 4)
+        encoded = test_str.byte_pair_encoding()
+        self.assertEqual(encoded.decode_byte_pair(), test_str)
+        self.assertEqual(encoded.decode_byte_pair(), test_str)  # cached table
+        self.assertEqual(''.join(encoded.iter_decode_byte_pair(5)), test_str)
+
+        # Nested rules expand fully in one pass
+        nested = String("$$c", ["# = ab", "$ = #a"])
+        self.assertEqual(nested.decode_byte_pair(), "abaabac")
+
     def test_cyclic_bits(self):
         """Test cyclic bit shifting."""
         test_str = String("test")
@@ -58,7 +126,36 @@ class TestStringEncoding(unittest.TestCase):
         neg_shifted = test_str.cyclic_bits(-5)
         neg_unshifted = neg_shifted.decode_cyclic_bits(-5)
         self.assertEqual(neg_unshifted, test_str)
-    
+
+    def test_cyclic_bits_rotation(self):
+        """Test whole-string bit rotation against known values."""
+        self.assertEqual(bits.rotate_left(b'\x81\x00', 1), b'\x02\x01')
+        self.assertEqual(bits.rotate_right(b'\x02\x01', 1), b'\x81\x00')
+        self.assertEqual(bits.rotate_left(b'\x81\x00', 17), bits.rotate_left(b'\x81\x00', 1))
+        self.assertEqual(bits.rotate_left(b'\x81\x00', -15), bits.rotate_left(b'\x81\x00', 1))
+
+        # Shifts larger than the bit length wrap around
+        test_str = String("rotate me")
+        self.assertEqual(test_str.cyclic_bits(3 + 72 * 5), test_str.cyclic_bits(3))
+        self.assertEqual(test_str.cyclic_bits(1000).decode_cyclic_bits(1000), test_str)
+
+    def test_cyclic_bits_file(self):
+        """Test that file rotation matches cyclic_bits on the same content."""
+        import os
+        import tempfile
+        test_str = String("file rotation \xff\x00 check")
+        with tempfile.TemporaryDirectory() as tmp:
+            src, dst, back = (os.path.join(tmp, name) for name in ('src', 'dst', 'back'))
+            with open(src, 'wb') as fh:
+                fh.write(test_str.encode('latin-1'))
+            for num in (0, 3, -11, 1000):
+                bits.cyclic_bits_file(src, dst, num, chunk_size=4)
+                with open(dst, 'rb') as fh:
+                    self.assertEqual(fh.read().decode('latin-1'), test_str.cyclic_bits(num))
+                bits.decode_cyclic_bits_file(dst, back, num, chunk_size=5)
+                with open(back, 'rb') as fh:
+                    self.assertEqual(fh.read().decode('latin-1'), test_str)
+
     def test_cyclic_chars(self):
         """Test cyclic character shifting."""
         test_str = String("Hello World")
@@ -70,6 +167,22 @@ class TestStringEncoding(unittest.TestCase):
         neg_shifted = test_str.cyclic_chars(-10)
         neg_unshifted = neg_shifted.decode_cyclic_chars(-10)
         self.assertEqual(neg_unshifted, test_str)
+
+        # Shifts wrap within printable ASCII and reuse cached tables
+        self.assertEqual(String("~ ").cyclic_chars(1), " !")
+        self.assertEqual(String("abc").cyclic_chars(95 + 2), String("abc").cyclic_chars(2))
+        self.assertIs(chars.cyclic_table(2), chars.cyclic_table(2))
+        with self.assertRaises(CyclicCharsError):
+            String("ab\n").cyclic_chars(3)
+
+        # A number that is not an integer is reported and shifts by 0
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            self.assertEqual(String("abc").cyclic_chars(2.5), "abc")
+            self.assertEqual(String("abc").decode_cyclic_chars("x"), "abc")
+        self.assertIn('Please enter a valid number.', out.getvalue())
+        with self.assertRaises(CyclicCharsError) as cm, contextlib.redirect_stdout(io.StringIO()):
+            String("abc\n").cyclic_chars(2.5)
+        self.assertEqual(cm.exception.message, "can't use cyclic chars with number False")
     
     def test_histogram(self):
         """Test character histogram generation."""
@@ -87,6 +200,21 @@ class TestStringEncoding(unittest.TestCase):
         self.assertEqual(hist['lower'], 4)   # e, l, l, o
         self.assertEqual(hist['other printable'], 3)  # space, !, !
     
+    def test_char_classes(self):
+        """Test the shared classification table against the priority groups."""
+        self.assertEqual(len(chars.CHAR_CLASS), 256)
+        for cls, group in enumerate(priority()):
+            for i in group:
+                self.assertEqual(chars.CHAR_CLASS[i], cls)
+        self.assertEqual(chars.char_class(' '), chars.SPACE)
+        self.assertEqual(chars.char_class('{'), chars.NONE)
+        self.assertEqual(chars.char_class('\u0100'), chars.NONE)
+
+        hist = String("a{ \x01\xe9\u0100").histogram_of_chars()
+        self.assertEqual(hist, {'control code': 1, 'digits': 0, 'upper': 0, 'lower': 1,
+                                'other printable': 1, 'higher than 128': 1})
+        self.assertEqual(sorted(group_name("aB1!")), [1, 2, 3, 4])
+    
     def test_string_operations(self):
         """Test that String class maintains its type after operations."""
         a = String("hello")
@@ -112,5 +240,21 @@ class TestStringEncoding(unittest.TestCase):
         for char in chars:
             self.assertIsInstance(char, String)
 
+    def test_lazy_iteration(self):
+        """Test lazy iteration and the shared empty rules list."""
+        a = String("hello")
+        it = iter(a)
+        self.assertIsInstance(next(it), String)
+        self.assertEqual(''.join(it), "ello")
+        self.assertEqual([type(c) for c in a.iter_chars()], [str] * 5)
+
+        # Strings without rules share one immutable, picklable empty list
+        self.assertEqual(a.rules, [])
+        self.assertIs(a.rules, a[1:].rules)
+        self.assertIs(pickle.loads(pickle.dumps(a.rules)), a.rules)
+        with self.assertRaises(TypeError):
+            a.rules.append("X = ab")
+        self.assertEqual(String("X", ["X = ab"]).rules, ["X = ab"])
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file